@@ -18,27 +18,99 @@ Error Handling:
 """
 
 import os
-import json
+import atexit
 import time
 import logging
 import hashlib
 import re
+import threading
+import queue
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Dict, Iterable, List, Optional, Union, Tuple
 from datetime import datetime
 import requests
 from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import click
+import orjson
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from datetime import timedelta
 
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Patterns used on every paginated/downloaded request, compiled once
+LINK_HEADER_PATTERN = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+API_PREFIX_PATTERN = re.compile(r'^/(wiki|rest)/')
+# Runs of characters that are not alphanumeric (str.isalnum), used for filenames
+NON_ALNUM_PATTERN = re.compile(r'[\W_]+')
+
+# Clients and local content managers flushed once more at exit in case a
+# run is interrupted; held weakly so instances no longer used can be freed
+_open_clients: "weakref.WeakSet[ConfluenceAPI]" = weakref.WeakSet()
+_open_managers: "weakref.WeakSet[LocalContentManager]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_at_exit():
+    """Write back the state that live instances still hold in memory"""
+    for client in list(_open_clients):
+        client.flush()
+    for manager in list(_open_managers):
+        manager.flush_mapping()
+
+def _parse_json(response: requests.Response):
+    """
+    Decode a JSON response body with orjson
+    
+    Invalid bodies raise requests' InvalidJSONError, like response.json()
+    does, so callers keep handling them as request failures.
+    """
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    """
+    Write a file in one write through a temp file and rename
+    
+    A crash mid-write leaves the previous file intact. The file is not
+    fsynced; cache files can be rebuilt from Confluence and the content dir.
+    """
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with temp_path.open('wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def _write_json_atomic(path: Path, data, indent: bool = False):
+    """Write a JSON cache file atomically, see _write_bytes_atomic"""
+    _write_bytes_atomic(path, orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None))
+
+def _write_queued_files(write_queue: "queue.Queue[Optional[Tuple[Path, bytes]]]"):
+    """
+    Background writer loop: write queued files until a None sentinel arrives
+    
+    The loop is handed the queue rather than the client, so a running
+    writer does not keep its client alive.
+    """
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        file_path, data = item
+        try:
+            _write_bytes_atomic(file_path, data)
+        except Exception as e:
+            # Any error is logged and the loop goes on; a dead writer would
+            # leave later writes queued and flush() waiting forever
+            logger.warning(f"Failed to write {file_path}: {str(e)}")
+
 class ConfluenceAPIError(Exception):
     """Custom exception for Confluence API errors"""
     def __init__(self, message: str, status_code: Optional[int] = None, response: Optional[str] = None):
@@ -55,38 +127,91 @@ class ConfluenceAPI:
     - Connection pooling
     - Automatic retries with exponential backoff
     - Request session reuse
+    - Independent requests are issued concurrently on a shared thread pool
     """
+
+    # Worker threads used to overlap independent requests on the shared session
+    MAX_WORKERS = 8
+    # Pages fetched by get_page_by_id are reused for this many seconds
+    PAGE_CACHE_TTL = 60
+    # Maximum number of pages kept by get_page_by_id
+    PAGE_CACHE_SIZE = 128
+    # Attachment download failures older than this many seconds are forgotten
+    FAILED_ATTACHMENT_WINDOW = 24 * 60 * 60
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, *, base_url: Optional[str] = None,
+                 username: Optional[str] = None, api_token: Optional[str] = None,
+                 space_key: Optional[str] = None):
+        """
+        Args:
+            session: A session created by another ConfluenceAPI for the same
+                instance and credentials; it is reused, so its connection
+                pool is shared. A new session is created when omitted.
+            base_url: The Confluence URL; defaults to CONFLUENCE_URL
+            username: The account name; defaults to CONFLUENCE_USERNAME
+            api_token: The API token; defaults to CONFLUENCE_API_TOKEN
+            space_key: The space to sync; defaults to CONFLUENCE_SPACE_KEY
+        """
         load_dotenv()
-        self.base_url = os.getenv('CONFLUENCE_URL')
-        self.username = os.getenv('CONFLUENCE_USERNAME')
-        self.api_token = os.getenv('CONFLUENCE_API_TOKEN')
-        self.space_key = os.getenv('CONFLUENCE_SPACE_KEY')
+        self.base_url = base_url or os.getenv('CONFLUENCE_URL')
+        self.username = username or os.getenv('CONFLUENCE_USERNAME')
+        self.api_token = api_token or os.getenv('CONFLUENCE_API_TOKEN')
+        self.space_key = space_key or os.getenv('CONFLUENCE_SPACE_KEY')
         self.api_version = os.getenv('CONFLUENCE_API_VERSION', '2')
         
         if not all([self.base_url, self.username, self.api_token, self.space_key]):
             raise ValueError("Missing required environment variables")
         
-        self.session = self._create_session()
+        self.session = session if session is not None else self._create_session()
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS)
+        self._space_id: Optional[str] = None
+        # Pages are pushed concurrently; only the first of them looks the
+        # space ID up and saves it, the others wait for its result
+        self._space_id_lock = threading.Lock()
+        # page_id -> (fetch time, page), least recently used first
+        self._page_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._page_cache_lock = threading.Lock()
+        # Failed attachment bookkeeping is kept in memory and written back in
+        # batches; downloads run concurrently, so the attachment state shared
+        # between download threads is only touched under the lock
+        self._failed_attachments: Optional[Dict[str, List[float]]] = None
+        self._failed_attachments_dirty = False
+        self._attachments_lock = threading.Lock()
+        # Metadata files are written by a background thread so downloads do
+        # not wait on the disk; the thread is started on first use
+        self._write_queue: "queue.Queue[Optional[Tuple[Path, bytes]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        # Attachment directories already created during this run
+        self._created_dirs: set = set()
+        _open_clients.add(self)
         self.local = LocalContentManager()  # Initialize LocalContentManager
+        self._download_url_variant = self._load_download_url_variants().get(self.base_url)
 
     def _create_session(self) -> requests.Session:
         """Create an optimized session with retries and connection pooling"""
         session = requests.Session()
         
         # Configure retries
+        # Idempotent writes are retried too; POST is left out so a create or
+        # upload that reached the server is never submitted twice
         retry_strategy = Retry(
             total=3,
             backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+            respect_retry_after_header=True,
+            # Spread out retries of concurrent requests that failed together
+            backoff_jitter=0.3,
         )
         
-        # Configure connection pooling
+        # Configure connection pooling; all requests go to a single host, so
+        # one pool is enough but it must hold enough connections for the
+        # concurrent requests issued from the thread pool
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=10
+            pool_connections=1,
+            pool_maxsize=32,
+            pool_block=False
         )
         
         session.mount("http://", adapter)
@@ -96,56 +221,64 @@ class ConfluenceAPI:
         session.auth = (self.username, self.api_token)
         session.headers.update({
             'Accept': 'application/json',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
         })
         
         return session
 
-    def get_space_content(self) -> Dict:
-        """Get all content from the space"""
-        print("DEBUG: Starting get_space_content")  # Temporary print
+    def get_space_content(self, space_id: Optional[str] = None) -> Dict:
+        """
+        Get all content from the space
+        
+        Args:
+            space_id: An already resolved space ID; looked up from the
+                configured space key (once per process) when omitted
+        """
+        if space_id is None:
+            space_id = self.get_space_id()
         
         try:
-            # First get the space ID from the key
-            url = f"{self.base_url}/wiki/api/v{self.api_version}/spaces"
-            params = {'keys': self.space_key}
-            
-            print(f"DEBUG: Getting space ID for key {self.space_key}")  # Temporary print
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            results = data.get('results', [])
-            if not results:
-                raise ConfluenceAPIError(f"Space {self.space_key} not found")
-            
-            space_id = results[0].get('id')
-            print(f"DEBUG: Found space ID: {space_id}")  # Temporary print
-            
-            # Now get the pages using the space ID
+            # Now get the pages using the space ID. Only the lightweight listing
+            # (IDs, titles, versions) is requested; bodies are fetched per page
+            # with get_page_by_id, and only for pages that changed
             url = f"{self.base_url}/wiki/api/v{self.api_version}/pages"
             params = {
                 'space-id': space_id,
                 'status': 'current',
-                'limit': 100,
-                'sort': 'created-date',
-                'body-format': 'storage',
-                'expand': 'body.storage,space'
+                'limit': 250,
+                'sort': 'created-date'
             }
             
-            print(f"DEBUG: Getting pages with params: {params}")  # Temporary print
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            results = []
+            while url:
+                logger.debug("Getting pages from %s", url)
+                response = self.session.get(url, params=params, timeout=(5, 30))
+                response.raise_for_status()
+                data = _parse_json(response)
+                results.extend(data.get('results', []))
+                
+                url = self._get_next_url(response)
+                params = {}  # Parameters are included in the URL
             
-            print(f"DEBUG: Got {len(data.get('results', []))} pages")  # Temporary print
+            data['results'] = results
+            logger.debug("Got %d pages", len(results))
             
             return data
             
         except requests.exceptions.RequestException as e:
-            print(f"DEBUG: API request failed: {str(e)}")  # Temporary print
             raise ConfluenceAPIError(f"Failed to get space content: {str(e)}")
 
+    def _get_next_url(self, response: requests.Response) -> Optional[str]:
+        """Get the next page URL of a paginated response from its Link header"""
+        link_header = response.headers.get('Link')
+        if link_header:
+            for url_match, rel in LINK_HEADER_PATTERN.findall(link_header):
+                if rel == 'next':
+                    # Confluence returns the next link relative to the site
+                    return f"{self.base_url}{url_match}" if url_match.startswith('/') else url_match
+        return None
+
     def get_space_id(self) -> str:
         """
         Get the space ID for the configured space key
@@ -156,70 +289,164 @@ class ConfluenceAPI:
         Raises:
             ConfluenceAPIError: If the space cannot be found
         """
-        spaces_url = f"{self.base_url}/wiki/api/v{self.api_version}/spaces"
-        try:
-            spaces_response = self.session.get(spaces_url, timeout=(5, 30))
-            spaces_response.raise_for_status()
-            spaces_data = spaces_response.json()
+        # The key to ID mapping never changes, so it is looked up at most once
+        # per cache directory and reused for every create/update afterwards
+        if self._space_id:
+            return self._space_id
             
-            # Find our space
-            space = next(
-                (s for s in spaces_data.get('results', []) 
-                 if s.get('key') == self.space_key),
-                None
-            )
-            
-            if not space:
-                raise ConfluenceAPIError(
-                    f"Space '{self.space_key}' not found",
-                    status_code=404
+        with self._space_id_lock:
+            if self._space_id:
+                return self._space_id
+                
+            space_ids = self._load_space_ids()
+            cache_key = f"{self.base_url}:{self.space_key}"
+            if space_ids.get(cache_key):
+                self._space_id = space_ids[cache_key]
+                return self._space_id
+                
+            spaces_url = f"{self.base_url}/wiki/api/v{self.api_version}/spaces"
+            try:
+                spaces_response = self.session.get(
+                    spaces_url,
+                    params={'keys': self.space_key},
+                    timeout=(5, 30)
+                )
+                spaces_response.raise_for_status()
+                spaces_data = _parse_json(spaces_response)
+                
+                # Find our space
+                space = next(
+                    (s for s in spaces_data.get('results', []) 
+                     if s.get('key') == self.space_key),
+                    None
                 )
                 
-            space_id = space.get('id')
-            if not space_id:
+                if not space:
+                    raise ConfluenceAPIError(
+                        f"Space '{self.space_key}' not found",
+                        status_code=404
+                    )
+                    
+                space_id = space.get('id')
+                if not space_id:
+                    raise ConfluenceAPIError(
+                        f"Could not get ID for space '{self.space_key}'",
+                        status_code=404
+                    )
+                    
+            except requests.exceptions.RequestException as e:
                 raise ConfluenceAPIError(
-                    f"Could not get ID for space '{self.space_key}'",
-                    status_code=404
+                    f"Failed to get space ID: {str(e)}",
+                    status_code=getattr(e.response, 'status_code', None),
+                    response=getattr(e.response, 'text', None)
                 )
                 
+            self._space_id = space_id
+            space_ids[cache_key] = space_id
+            self._save_space_ids(space_ids)
             return space_id
-            
-        except requests.exceptions.RequestException as e:
-            raise ConfluenceAPIError(
-                f"Failed to get space ID: {str(e)}",
-                status_code=getattr(e.response, 'status_code', None),
-                response=getattr(e.response, 'text', None)
-            )
+
+    def _load_space_ids(self) -> Dict[str, str]:
+        """Load the persisted space key to ID mapping"""
+        space_ids_file = self.local.cache_dir / 'space_ids.json'
+        try:
+            with space_ids_file.open('r') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except (orjson.JSONDecodeError, OSError) as e:
+            logger.warning(f"Failed to load space IDs: {str(e)}")
+        return {}
+
+    def _save_space_ids(self, space_ids: Dict[str, str]):
+        """Persist the space key to ID mapping"""
+        try:
+            _write_json_atomic(self.local.cache_dir / 'space_ids.json', space_ids)
+        except OSError as e:
+            logger.error(f"Failed to save space IDs: {str(e)}")
 
     def get_page_by_id(self, page_id: str) -> Dict:
-        """Get a page by its ID"""
-        print(f"DEBUG: Getting page by ID: {page_id}")  # Debug print
+        """
+        Get a page by its ID
         
+        Pages are cached for PAGE_CACHE_TTL seconds so repeated lookups within
+        a sync do not hit the API again; writes through this client drop the
+        cached copy.
+        """
+        with self._page_cache_lock:
+            cached = self._page_cache.get(page_id)
+            if cached and time.monotonic() - cached[0] < self.PAGE_CACHE_TTL:
+                self._page_cache.move_to_end(page_id)
+                return cached[1]
+                
         url = f"{self.base_url}/wiki/api/v{self.api_version}/pages/{page_id}"
         params = {
             'body-format': 'storage',
             'expand': 'body.storage,space,version'  # Add body.storage to expansion
         }
         
-        print(f"DEBUG: Request URL: {url}")  # Debug print
-        print(f"DEBUG: Request params: {params}")  # Debug print
-        
+        logger.debug("Getting page %s", page_id)
         try:
-            response = self.session.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=(5, 30))
             response.raise_for_status()
-            data = response.json()
-            
-            print(f"DEBUG: Response data keys: {list(data.keys())}")  # Debug print
-            if 'body' in data:
-                print(f"DEBUG: Body keys: {list(data['body'].keys())}")  # Debug print
-                if 'storage' in data['body']:
-                    print(f"DEBUG: Storage value length: {len(data['body']['storage'].get('value', ''))}")  # Debug print
-            
-            return data
+            page = _parse_json(response)
             
         except requests.exceptions.RequestException as e:
-            print(f"DEBUG: API request failed: {str(e)}")  # Debug print
             raise ConfluenceAPIError(f"Failed to get page {page_id}: {str(e)}")
+            
+        with self._page_cache_lock:
+            self._page_cache[page_id] = (time.monotonic(), page)
+            self._page_cache.move_to_end(page_id)
+            if len(self._page_cache) > self.PAGE_CACHE_SIZE:
+                self._page_cache.popitem(last=False)
+        return page
+
+    def _invalidate_page(self, page_id: str):
+        """Drop a page from the get_page_by_id cache"""
+        with self._page_cache_lock:
+            self._page_cache.pop(page_id, None)
+
+    def prefetch_pages(self, page_ids: Iterable[str]) -> int:
+        """
+        Fetch several pages with one listing request and cache them
+        
+        The page listing returns the same fields as get_page_by_id, so a
+        following get_page_by_id of one of these pages is served from the
+        cache. Failures are only logged; get_page_by_id then fetches the
+        pages one by one.
+        
+        Args:
+            page_ids: IDs of the pages; up to 250 are fetched per request
+            
+        Returns:
+            int: The number of pages cached
+        """
+        page_ids = list(dict.fromkeys(str(page_id) for page_id in page_ids if page_id))
+        url = f"{self.base_url}/wiki/api/v{self.api_version}/pages"
+        cached = 0
+        for start in range(0, len(page_ids), 250):
+            batch = page_ids[start:start + 250]
+            next_url = url
+            params = {'id': ','.join(batch), 'body-format': 'storage', 'limit': len(batch)}
+            logger.debug("Prefetching %d pages", len(batch))
+            try:
+                while next_url:
+                    response = self.session.get(next_url, params=params, timeout=(5, 30))
+                    response.raise_for_status()
+                    pages = _parse_json(response).get('results', [])
+                    fetched_at = time.monotonic()
+                    with self._page_cache_lock:
+                        for page in pages:
+                            self._page_cache[page['id']] = (fetched_at, page)
+                            self._page_cache.move_to_end(page['id'])
+                        while len(self._page_cache) > self.PAGE_CACHE_SIZE:
+                            self._page_cache.popitem(last=False)
+                    cached += len(pages)
+                    next_url = self._get_next_url(response)
+                    params = {}  # Parameters are included in the URL
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Failed to prefetch pages: {e}")
+        return cached
 
     def update_page(self, page_id: str, content: Dict) -> Dict:
         """
@@ -278,24 +505,28 @@ class ConfluenceAPI:
 
                 try:
                     logger.info(f"Converting page {page_id} to draft status")
-                    response = self.session.put(url, json=draft_data, timeout=(5, 30))
+                    response = self.session.put(url, data=orjson.dumps(draft_data), timeout=(5, 30))
+                    self._invalidate_page(page_id)
                     response.raise_for_status()
 
-                    # Wait and verify the page is actually in draft status
-                    max_draft_checks = 3
-                    draft_check_count = 0
-                    while draft_check_count < max_draft_checks:
-                        time.sleep(1)  # Wait a second before checking
+                    # Wait and verify the page is actually in draft status,
+                    # starting with a short wait and doubling it on every check
+                    # (0.2s + 0.4s + 0.8s + 1.6s, about 3s in total)
+                    max_draft_checks = 4
+                    delay = 0.2
+                    for _ in range(max_draft_checks):
+                        time.sleep(delay)
+                        self._invalidate_page(page_id)
                         current_page = self.get_page_by_id(page_id)
                         if current_page.get('status') == 'draft':
                             logger.info(f"Successfully converted page {page_id} to draft")
                             break
-                        draft_check_count += 1
-                        if draft_check_count == max_draft_checks:
-                            raise ConfluenceAPIError(
-                                f"Failed to convert page {page_id} to draft status after {max_draft_checks} attempts",
-                                status_code=400
-                            )
+                        delay *= 2
+                    else:
+                        raise ConfluenceAPIError(
+                            f"Failed to convert page {page_id} to draft status after {max_draft_checks} attempts",
+                            status_code=400
+                        )
                 except requests.exceptions.RequestException as e:
                     raise ConfluenceAPIError(f"Failed to convert page {page_id} to draft", e)
 
@@ -303,21 +534,23 @@ class ConfluenceAPI:
             update_data['spaceId'] = new_space_id
 
         try:
-            response = self.session.put(url, json=update_data, timeout=(5, 30))
+            response = self.session.put(url, data=orjson.dumps(update_data), timeout=(5, 30))
+            self._invalidate_page(page_id)
             response.raise_for_status()
-            return response.json()
+            return _parse_json(response)
         except requests.exceptions.RequestException as e:
             if isinstance(e, requests.exceptions.HTTPError):
                 try:
-                    error_data = e.response.json()
+                    error_data = orjson.loads(e.response.content)
                     error_message = error_data.get('errors', [{}])[0].get('title', str(e))
                     logger.error(f"Error updating page {page_id} (status: {e.response.status_code})")
-                    logger.error(f"Error response: {json.dumps(error_data)}")
+                    error_text = orjson.dumps(error_data).decode()
+                    logger.error(f"Error response: {error_text}")
                     raise ConfluenceAPIError(
-                        f"Failed to update page {page_id} (HTTP {e.response.status_code}): {json.dumps(error_data)}",
+                        f"Failed to update page {page_id} (HTTP {e.response.status_code}): {error_text}",
                         status_code=e.response.status_code
                     )
-                except (json.JSONDecodeError, KeyError, AttributeError):
+                except (orjson.JSONDecodeError, KeyError, AttributeError):
                     pass
             raise ConfluenceAPIError(f"Failed to update page {page_id}", e)
 
@@ -351,17 +584,18 @@ class ConfluenceAPI:
         }
         
         try:
-            logger.debug(f"Creating new page with data: {json.dumps(create_data)}")
-            response = self.session.post(url, json=create_data, timeout=(5, 30))
+            payload = orjson.dumps(create_data)
+            logger.debug(f"Creating new page with data: {payload.decode()}")
+            response = self.session.post(url, data=payload, timeout=(5, 30))
             response.raise_for_status()
-            return response.json()
+            return _parse_json(response)
         except requests.exceptions.RequestException as e:
             if e.response and e.response.status_code == 400:
                 error_details = e.response.text
                 logger.error(f"Failed to create page. API Response: {error_details}")
                 try:
-                    error_json = e.response.json()
-                    logger.error(f"Detailed error: {json.dumps(error_json, indent=2)}")
+                    error_json = orjson.loads(e.response.content)
+                    logger.error(f"Detailed error: {orjson.dumps(error_json, option=orjson.OPT_INDENT_2).decode()}")
                 except:
                     pass
             raise ConfluenceAPIError(
@@ -402,24 +636,16 @@ class ConfluenceAPI:
         
         try:
             while url and len(all_results) < limit:
-                logger.debug(f"Getting attachments from {url}")
+                logger.debug("Getting attachments from %s", url)
                 response = self.session.get(url, params=params, timeout=(5, 30))
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _parse_json(response)
                 results = data.get('results', [])
                 all_results.extend(results)
                 
-                # Get next page URL from Link header
-                url = None
-                link_header = response.headers.get('Link')
-                if link_header:
-                    matches = re.findall(r'<([^>]+)>;\s*rel="([^"]+)"', link_header)
-                    for url_match, rel in matches:
-                        if rel == 'next':
-                            url = url_match
-                            params = {}  # Parameters are included in the URL
-                            break
+                url = self._get_next_url(response)
+                params = {}  # Parameters are included in the URL
                             
             return all_results[:limit]
             
@@ -445,30 +671,30 @@ class ConfluenceAPI:
         Raises:
             ConfluenceAPIError: If any request fails
         """
+        url = f"{self.base_url}/wiki/api/v{self.api_version}/attachments/{attachment_id}"
         try:
+            # The basic info, versions, labels and properties are independent,
+            # so issue all four requests at once instead of one after another
+            futures = {
+                key: self._executor.submit(self.session.get, f"{url}{suffix}", timeout=(5, 30))
+                for key, suffix in (
+                    (None, ''),
+                    ('versions', '/versions'),
+                    ('labels', '/labels'),
+                    ('properties', '/properties'),
+                )
+            }
+            
             # Get basic attachment info
-            url = f"{self.base_url}/wiki/api/v{self.api_version}/attachments/{attachment_id}"
-            response = self.session.get(url, timeout=(5, 30))
+            response = futures.pop(None).result()
             response.raise_for_status()
-            metadata = response.json()
+            metadata = _parse_json(response)
             
-            # Get versions
-            url = f"{self.base_url}/wiki/api/v{self.api_version}/attachments/{attachment_id}/versions"
-            response = self.session.get(url, timeout=(5, 30))
-            if response.ok:
-                metadata['versions'] = response.json().get('results', [])
-            
-            # Get labels
-            url = f"{self.base_url}/wiki/api/v{self.api_version}/attachments/{attachment_id}/labels"
-            response = self.session.get(url, timeout=(5, 30))
-            if response.ok:
-                metadata['labels'] = response.json().get('results', [])
-            
-            # Get properties
-            url = f"{self.base_url}/wiki/api/v{self.api_version}/attachments/{attachment_id}/properties"
-            response = self.session.get(url, timeout=(5, 30))
-            if response.ok:
-                metadata['properties'] = response.json().get('results', [])
+            # Get versions, labels and properties
+            for key, future in futures.items():
+                response = future.result()
+                if response.ok:
+                    metadata[key] = _parse_json(response).get('results', [])
             
             return metadata
             
@@ -489,16 +715,41 @@ class ConfluenceAPI:
             
             # Create metadata directory
             metadata_dir = self.local.attachments_dir / str(page_id) / '.metadata'
-            metadata_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(metadata_dir)
             
-            # Save metadata JSON
+            # Save metadata JSON in the background
             metadata_file = metadata_dir / f"{attachment['title']}.json"
-            with metadata_file.open('w') as f:
-                json.dump(metadata, f, indent=2)
+            self._queue_write(metadata_file, orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
                 
         except Exception as e:
             logger.warning(f"Failed to save metadata for attachment {attachment.get('title', 'Unknown')}: {str(e)}")
 
+    def _ensure_dir(self, directory: Path):
+        """Create a directory unless it was already created during this run"""
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def _queue_write(self, file_path: Path, data: bytes):
+        """Queue a file write for the background writer thread"""
+        with self._attachments_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=_write_queued_files, args=(self._write_queue,), daemon=True)
+                self._writer.start()
+            self._write_queue.put((file_path, data))
+
+    def flush(self):
+        """Wait until queued metadata writes and attachment bookkeeping are on disk"""
+        # The current writer is stopped with a sentinel on its own queue;
+        # writes queued from here on start a new writer on a fresh queue
+        with self._attachments_lock:
+            writer, write_queue = self._writer, self._write_queue
+            self._writer, self._write_queue = None, queue.Queue()
+        if writer is not None:
+            write_queue.put(None)
+            writer.join()
+        self._flush_failed_attachments()
+
     def download_attachment(self, page_id: str, attachment: Dict) -> bytes:
         """
         Download an attachment's content with retry logic
@@ -513,9 +764,31 @@ class ConfluenceAPI:
         Raises:
             ConfluenceAPIError: If the download fails after retries
         """
-        max_retries = 3
-        retry_delay = 1  # seconds
+        response = self._open_attachment_stream(page_id, attachment)
+        with response:
+            content = response.content
+        logger.debug("Successfully downloaded %d bytes", len(content))
+        return content
+
+    def _open_attachment_stream(self, page_id: str, attachment: Dict) -> requests.Response:
+        """
+        Open a streaming download of an attachment
         
+        Transient failures (429 and 5xx) are retried by the session; the
+        next URL variant is only tried when one answers 404. The body has
+        not been read yet when this returns; the caller is responsible for
+        consuming and closing the response.
+        
+        Args:
+            page_id: The ID of the page
+            attachment: The attachment metadata
+            
+        Returns:
+            requests.Response: The open streaming response
+            
+        Raises:
+            ConfluenceAPIError: If the download fails after retries
+        """
         # Get the download URL from the attachment metadata
         download_url = attachment.get('_links', {}).get('download')
         if not download_url:
@@ -523,67 +796,65 @@ class ConfluenceAPI:
             logger.error(error_msg)
             raise ConfluenceAPIError(error_msg)
 
-        # Try different URL patterns based on Confluence API v2 specification
+        # Try different URL patterns based on Confluence API v2 specification,
+        # each tagged with the name of its variant
         url_patterns = []
         
         # If it's a relative URL
         if download_url.startswith('/'):
             # Strip any leading /wiki or /rest to normalize the path
-            clean_path = re.sub(r'^/(wiki|rest)/', '/', download_url)
+            clean_path = API_PREFIX_PATTERN.sub('/', download_url)
             
             # Try different URL combinations according to the API spec
             url_patterns = [
-                f"{self.base_url}{clean_path}",  # Direct to API
-                f"{self.base_url}/wiki{clean_path}",  # Through wiki path
-                f"{self.base_url}/rest{clean_path}",  # Through REST path
-                f"{self.base_url}/download{clean_path}"  # Direct download path
+                ('api', f"{self.base_url}{clean_path}"),  # Direct to API
+                ('wiki', f"{self.base_url}/wiki{clean_path}"),  # Through wiki path
+                ('rest', f"{self.base_url}/rest{clean_path}"),  # Through REST path
+                ('download', f"{self.base_url}/download{clean_path}")  # Direct download path
             ]
             
             # If it's a download URL, also try the special download endpoints
             if 'download' in clean_path:
                 url_patterns.extend([
-                    f"{self.base_url}/attachments/{page_id}/download",
-                    f"{self.base_url}/wiki/attachments/{page_id}/download"
+                    ('page-download', f"{self.base_url}/attachments/{page_id}/download"),
+                    ('wiki-page-download', f"{self.base_url}/wiki/attachments/{page_id}/download")
                 ])
+                
+            # Every attachment of an instance is served by the same variant, so
+            # try the one that worked last time before probing the others
+            url_patterns.sort(key=lambda pattern: pattern[0] != self._download_url_variant)
         else:
             # If it's already a full URL, use it as is
-            url_patterns = [download_url]
+            url_patterns = [(None, download_url)]
 
         last_error = None
-        for url in url_patterns:
-            for attempt in range(max_retries):
-                try:
-                    logger.debug(f"Downloading attachment from {url} (attempt {attempt + 1}/{max_retries})")
-                    response = self.session.get(
-                        url,
-                        timeout=(5, 30),
-                        headers={'Accept': '*/*'}  # Accept any content type
-                    )
-                    
-                    # Check for specific error cases
-                    if response.status_code == 404:
-                        logger.warning(f"Attachment not found at {url}")
-                        break  # Try next URL format
-                    
-                    response.raise_for_status()
-                    content_length = len(response.content)
-                    logger.debug(f"Successfully downloaded {content_length} bytes")
-                    return response.content
-                    
-                except requests.exceptions.RequestException as e:
-                    last_error = e
-                    error_msg = f"Failed to download attachment {attachment.get('title', 'Unknown')}"
-                    if hasattr(e, 'response') and e.response is not None:
-                        error_msg += f": {e.response.status_code}"
-                        if e.response.status_code == 404:
-                            break  # Try next URL format
-                    else:
-                        error_msg += f": {str(e)}"
-                    
-                    logger.warning(f"{error_msg} - Attempt {attempt + 1}/{max_retries}")
-                    
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
+        for variant, url in url_patterns:
+            try:
+                logger.debug("Downloading attachment from %s", url)
+                response = self.session.get(
+                    url,
+                    timeout=(5, 30),
+                    headers={'Accept': '*/*'},  # Accept any content type
+                    stream=True
+                )
+                
+                if response.status_code == 404:
+                    logger.warning(f"Attachment not found at {url}")
+                    response.close()
+                    continue  # Try next URL format
+                
+                if not response.ok:
+                    response.close()
+                response.raise_for_status()
+                
+                if variant and variant != self._download_url_variant:
+                    self._save_download_url_variant(variant)
+                return response
+                
+            except requests.exceptions.RequestException as e:
+                # The session has already retried transient errors
+                last_error = e
+                break
                         
         # If we get here, all attempts failed
         error_msg = f"Failed to download attachment {attachment.get('title', 'Unknown')} after trying multiple URLs"
@@ -594,17 +865,54 @@ class ConfluenceAPI:
         logger.error(error_msg)
         raise ConfluenceAPIError(error_msg)
 
+    def _load_download_url_variants(self) -> Dict[str, str]:
+        """Load the attachment download URL variants that last worked, keyed by base URL"""
+        variants_file = self.local.cache_dir / 'download_url_variants.json'
+        try:
+            with variants_file.open('r') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except (orjson.JSONDecodeError, OSError) as e:
+            logger.warning(f"Failed to load attachment URL variants: {str(e)}")
+        return {}
+
+    def _save_download_url_variant(self, variant: str):
+        """Remember the attachment download URL variant that worked for this instance"""
+        with self._attachments_lock:
+            self._download_url_variant = variant
+            variants = self._load_download_url_variants()
+            variants[self.base_url] = variant
+            try:
+                _write_json_atomic(self.local.cache_dir / 'download_url_variants.json', variants)
+            except OSError as e:
+                logger.warning(f"Failed to save attachment URL variants: {str(e)}")
+
     def upload_attachment(self, page_id: str, file_path: Path) -> Dict:
-        """Upload an attachment to a page"""
+        """
+        Upload an attachment to a page
+        
+        The multipart body is streamed from the file as it is sent, so large
+        attachments are never held in memory.
+        """
         url = f"{self.base_url}/wiki/api/v{self.api_version}/attachments"
-        files = {
-            'file': (file_path.name, file_path.open('rb'), 'application/octet-stream')
-        }
-        data = {'id': page_id}
         try:
-            response = self.session.post(url, files=files, data=data, timeout=(5, 30))
+            with file_path.open('rb') as f:
+                encoder = MultipartEncoder(fields={
+                    'id': page_id,
+                    'file': (file_path.name, f, 'application/octet-stream')
+                })
+                response = self.session.post(
+                    url,
+                    data=encoder,
+                    headers={
+                        'Content-Type': encoder.content_type,
+                        'X-Atlassian-Token': 'nocheck'
+                    },
+                    timeout=(5, 30)
+                )
             response.raise_for_status()
-            return response.json()
+            return _parse_json(response)
         except requests.exceptions.RequestException as e:
             raise ConfluenceAPIError(f"Failed to upload attachment to page {page_id}: {str(e)}")
 
@@ -623,6 +931,7 @@ class ConfluenceAPI:
         try:
             logger.debug(f"Deleting page {page_id}")
             response = self.session.delete(url, timeout=(5, 30))
+            self._invalidate_page(page_id)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             if e.response and e.response.status_code == 404:
@@ -653,19 +962,18 @@ class ConfluenceAPI:
             return
             
         try:
-            # Get the attachment content
-            content = self.download_attachment(page_id, attachment)
+            # Open the attachment download without buffering the body
+            response = self._open_attachment_stream(page_id, attachment)
             
             # Create the attachments directory for this page
             page_attachments_dir = self.local.attachments_dir / str(page_id)
-            page_attachments_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(page_attachments_dir)
             
             # Save the attachment with proper error handling
             file_path = page_attachments_dir / filename
             try:
-                with file_path.open('wb') as f:
-                    f.write(content)
-                logger.info(f"Successfully downloaded attachment {filename} ({len(content)} bytes)")
+                size = self._write_attachment(response, file_path)
+                logger.info(f"Successfully downloaded attachment {filename} ({size} bytes)")
                 self._clear_failed_attachment(filename)
                 
                 # Save metadata after successful download
@@ -682,71 +990,115 @@ class ConfluenceAPI:
             logger.error(f"Unexpected error downloading attachment {filename}: {str(e)}")
             self._mark_failed_attachment(filename)
 
-    def _should_skip_attachment(self, filename: str) -> bool:
-        """Check if an attachment should be skipped based on previous failures"""
-        failed_attachments_file = self.local.cache_dir / '.failed_attachments'
-        if not failed_attachments_file.exists():
-            return False
+    def _write_attachment(self, response: requests.Response, file_path: Path) -> int:
+        """
+        Stream a download response to disk chunk by chunk
+        
+        The body is written to a temporary file that only replaces the
+        target once it is complete, so an interrupted or truncated download
+        never leaves a partial attachment behind.
+        
+        Args:
+            response: An open streaming response
+            file_path: Where to save the attachment
+            
+        Returns:
+            int: The number of bytes written
             
+        Raises:
+            ConfluenceAPIError: If fewer bytes arrive than announced
+            OSError: If the file cannot be written
+        """
+        temp_path = file_path.with_name(f"{file_path.name}.part")
+        size = 0
         try:
-            with failed_attachments_file.open('r') as f:
-                failed_attachments = json.load(f)
+            with response, temp_path.open('wb') as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+                    size += len(chunk)
+                    
+            # Content-Length is the encoded size, so only compare it for
+            # bodies that were sent without a content encoding
+            expected = response.headers.get('Content-Length')
+            if expected and not response.headers.get('Content-Encoding') and int(expected) != size:
+                raise ConfluenceAPIError(
+                    f"Incomplete download of {file_path.name}: got {size} of {expected} bytes"
+                )
                 
-            # Check if the attachment has failed multiple times recently
-            if filename in failed_attachments:
-                failures = failed_attachments[filename]
-                if len(failures) >= 3:  # Skip after 3 failures
-                    last_failure = datetime.fromisoformat(failures[-1])
-                    if datetime.now() - last_failure < timedelta(hours=24):
-                        return True
-            return False
-        except (json.JSONDecodeError, OSError):
-            return False
+            os.replace(temp_path, file_path)
+            return size
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def _get_failed_attachments(self) -> Dict[str, List[float]]:
+        """
+        Return the in-memory failed attachments map, loading it on first use
+        
+        Failure times are epoch seconds; ISO strings written by older
+        versions are converted on load. Callers must hold _attachments_lock.
+        """
+        if self._failed_attachments is None:
+            self._failed_attachments = {}
+            failed_attachments_file = self.local.cache_dir / '.failed_attachments'
+            try:
+                with failed_attachments_file.open('r') as f:
+                    self._failed_attachments = {
+                        filename: [
+                            datetime.fromisoformat(ts).timestamp() if isinstance(ts, str) else ts
+                            for ts in failures
+                        ]
+                        for filename, failures in orjson.loads(f.read()).items()
+                    }
+            except FileNotFoundError:
+                pass
+            except (orjson.JSONDecodeError, OSError, ValueError) as e:
+                logger.warning(f"Failed to load failed attachments list: {str(e)}")
+        return self._failed_attachments
+
+    def _flush_failed_attachments(self):
+        """Write the failed attachments map to disk if it changed"""
+        with self._attachments_lock:
+            if not self._failed_attachments_dirty:
+                return
+                
+            try:
+                _write_json_atomic(self.local.cache_dir / '.failed_attachments', self._failed_attachments)
+                self._failed_attachments_dirty = False
+            except OSError as e:
+                logger.error(f"Failed to save failed attachments list: {str(e)}")
+
+    def _should_skip_attachment(self, filename: str) -> bool:
+        """Check if an attachment should be skipped based on previous failures"""
+        with self._attachments_lock:
+            failures = self._get_failed_attachments().get(filename, [])
+            
+        # Check if the attachment has failed multiple times recently
+        if len(failures) >= 3:  # Skip after 3 failures
+            if time.time() - failures[-1] < self.FAILED_ATTACHMENT_WINDOW:
+                return True
+        return False
 
     def _mark_failed_attachment(self, filename: str):
         """Mark an attachment as failed"""
-        failed_attachments_file = self.local.cache_dir / '.failed_attachments'
-        try:
-            failed_attachments = {}
-            if failed_attachments_file.exists():
-                with failed_attachments_file.open('r') as f:
-                    failed_attachments = json.load(f)
-                    
-            # Add new failure timestamp
-            if filename not in failed_attachments:
-                failed_attachments[filename] = []
-            failed_attachments[filename].append(datetime.now().isoformat())
+        with self._attachments_lock:
+            failed_attachments = self._get_failed_attachments()
             
-            # Keep only recent failures
+            # Add new failure timestamp, keeping only recent failures
+            now = time.time()
             failed_attachments[filename] = [
-                ts for ts in failed_attachments[filename]
-                if datetime.now() - datetime.fromisoformat(ts) < timedelta(hours=24)
-            ]
-            
-            with failed_attachments_file.open('w') as f:
-                json.dump(failed_attachments, f)
-                
-        except (json.JSONDecodeError, OSError) as e:
-            logger.error(f"Failed to update failed attachments list: {str(e)}")
+                ts for ts in failed_attachments.get(filename, [])
+                if now - ts < self.FAILED_ATTACHMENT_WINDOW
+            ] + [now]
+            self._failed_attachments_dirty = True
 
     def _clear_failed_attachment(self, filename: str):
         """Remove an attachment from the failed list"""
-        failed_attachments_file = self.local.cache_dir / '.failed_attachments'
-        if not failed_attachments_file.exists():
-            return
-            
-        try:
-            with failed_attachments_file.open('r') as f:
-                failed_attachments = json.load(f)
-                
+        with self._attachments_lock:
+            failed_attachments = self._get_failed_attachments()
             if filename in failed_attachments:
                 del failed_attachments[filename]
-                
-            with failed_attachments_file.open('w') as f:
-                json.dump(failed_attachments, f)
-                
-        except (json.JSONDecodeError, OSError) as e:
-            logger.error(f"Failed to clear failed attachment: {str(e)}")
+                self._failed_attachments_dirty = True
 
     def _clean_adf_content(self, content: Dict) -> Dict:
         """
@@ -755,18 +1107,19 @@ class ConfluenceAPI:
         if not content:
             return {}
 
+        value = content.get('value')
+
         # Handle nested value structure
-        if isinstance(content.get('value'), dict):
-            value = content['value']
+        if isinstance(value, dict):
             if value.get('representation') == 'atlas_doc_format':
                 return {'value': value.get('value', {})}
             return {'value': value}
 
         # Handle JSON string value
-        if isinstance(content.get('value'), str):
+        if isinstance(value, str):
             try:
-                return {'value': json.loads(content['value'])}
-            except json.JSONDecodeError:
+                return {'value': orjson.loads(value)}
+            except orjson.JSONDecodeError:
                 return {}
 
         return content
@@ -784,24 +1137,18 @@ class ConfluenceAPI:
         Raises:
             ConfluenceAPIError: If the API request fails or page is not in the correct space
         """
-        print(f"DEBUG: Getting body for page {page_id}")  # Temporary print for debugging
-        
         url = f"{self.base_url}/wiki/api/v{self.api_version}/pages/{page_id}"
         params = {
             'body-format': 'storage',
             'expand': 'body.storage,space'  # Add space to expansion
         }
         
-        print(f"DEBUG: Request URL: {url}")  # Temporary print for debugging
-        print(f"DEBUG: Request params: {params}")  # Temporary print for debugging
+        logger.debug("Getting body for page %s from %s with params %s", page_id, url, params)
         
         try:
-            response = self.session.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=(5, 30))
             response.raise_for_status()
-            data = response.json()
-            
-            print(f"DEBUG: Response status: {response.status_code}")  # Temporary print
-            print(f"DEBUG: Response data keys: {list(data.keys())}")  # Temporary print
+            data = _parse_json(response)
             
             # Verify page is in the correct space
             space = data.get('space', {})
@@ -810,16 +1157,11 @@ class ConfluenceAPI:
             
             # Extract and return the body content
             body = data.get('body', {})
-            print(f"DEBUG: Body keys: {list(body.keys())}")  # Temporary print
-            
             storage = body.get('storage', {})
-            print(f"DEBUG: Storage keys: {list(storage.keys())}")  # Temporary print
-            
             value = storage.get('value', '')
-            print(f"DEBUG: Body content length: {len(value)}")  # Temporary print
             
             if not value:
-                print(f"DEBUG: No body content found for page {page_id}")  # Temporary print
+                logger.debug("No body content found for page %s", page_id)
             
             return {
                 'representation': 'storage',
@@ -827,7 +1169,6 @@ class ConfluenceAPI:
             }
             
         except requests.exceptions.RequestException as e:
-            print(f"DEBUG: API request failed: {str(e)}")  # Temporary print
             raise ConfluenceAPIError(f"Failed to get page body: {str(e)}")
 
 class LocalContentManager:
@@ -843,25 +1184,114 @@ class LocalContentManager:
         # Load or create the ID to filename mapping
         self.id_map_file = self.cache_dir / 'id_mapping.json'
         self.id_to_filename = self._load_id_mapping()
+        # Mapping changes are written once by flush_mapping, not per change
+        self._mapping_dirty = False
+        _open_managers.add(self)
+        
+        # File hashes keyed by filename, reused while mtime and size match;
+        # loaded on first use
+        self.hash_cache_file = self.cache_dir / 'hash_cache.json'
+        self._hash_cache: Optional[Dict[str, List]] = None
+        self._hash_cache_dirty = False
+
+    @property
+    def id_to_filename(self) -> Dict[str, str]:
+        """Mapping of page IDs to local filenames (without .json extension)"""
+        return self._id_to_filename
+
+    @id_to_filename.setter
+    def id_to_filename(self, mapping: Dict[str, str]):
+        # Keep a reverse index so filename lookups don't scan the mapping
+        self._id_to_filename = mapping
+        self._filename_to_id = {
+            filename: page_id for page_id, filename in mapping.items()
+            if isinstance(filename, str)
+        }
+
+    def forget_page_id(self, page_id: str) -> bool:
+        """
+        Remove a page ID from the mapping
+        
+        Args:
+            page_id: The page ID to remove
+            
+        Returns:
+            bool: True if the page ID was mapped
+        """
+        filename = self._id_to_filename.pop(page_id, None)
+        if filename is None:
+            return False
+        if self._filename_to_id.get(filename) == page_id:
+            del self._filename_to_id[filename]
+        self._mapping_dirty = True
+        return True
 
     def _load_id_mapping(self) -> Dict[str, str]:
         """Load the ID to filename mapping from cache"""
         try:
-            if self.id_map_file.exists():
-                with self.id_map_file.open('r') as f:
-                    return json.load(f)
+            with self.id_map_file.open('r') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to load ID mapping: {e}")
         return {}
 
-    def _save_id_mapping(self):
-        """Save the ID to filename mapping to cache"""
+    def flush_mapping(self):
+        """Save the ID to filename mapping to cache if it changed"""
+        if not self._mapping_dirty:
+            return
         try:
-            with self.id_map_file.open('w') as f:
-                json.dump(self.id_to_filename, f, indent=2)
+            _write_json_atomic(self.id_map_file, self.id_to_filename)
+            self._mapping_dirty = False
         except Exception as e:
             logger.error(f"Failed to save ID mapping: {e}")
 
+    def _load_hash_cache(self) -> Dict[str, List]:
+        """Load the file hash cache from disk"""
+        try:
+            with self.hash_cache_file.open('r') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load hash cache: {e}")
+        return {}
+
+    def save_hash_cache(self):
+        """Save the file hash cache to disk if it changed"""
+        if not self._hash_cache_dirty:
+            return
+        try:
+            _write_json_atomic(self.hash_cache_file, self._hash_cache)
+            self._hash_cache_dirty = False
+        except Exception as e:
+            logger.error(f"Failed to save hash cache: {e}")
+
+    def _get_cached_file_hash(self, entry: os.DirEntry, hash_cache: Dict[str, List]) -> str:
+        """
+        Return the hash of a file, reusing the cached one if the file is unchanged
+        
+        Args:
+            entry: The directory entry of the file to hash
+            hash_cache: Entries of [mtime_ns, size, hash] keyed by filename;
+                the entry for this file is added or refreshed
+            
+        Returns:
+            str: The MD5 hash of the file
+        """
+        stat = entry.stat()
+        cached = self._hash_cache.get(entry.name) if self._hash_cache else None
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            hash_cache[entry.name] = cached
+            return cached[2]
+            
+        file_hash = self._get_file_hash(entry.path)
+        if file_hash:
+            hash_cache[entry.name] = [stat.st_mtime_ns, stat.st_size, file_hash]
+            self._hash_cache_dirty = True
+        return file_hash
+
     def _sanitize_filename(self, title: str) -> str:
         """
         Convert a title to a safe filename
@@ -872,41 +1302,67 @@ class LocalContentManager:
         Returns:
             str: A filename-safe version of the title
         """
-        # Remove or replace unsafe characters
-        safe_name = "".join(c.lower() if c.isalnum() else '-' for c in title)
-        # Remove consecutive dashes and trim
-        safe_name = '-'.join(filter(None, safe_name.split('-')))
+        # Replace each run of unsafe characters with a single dash and trim
+        safe_name = NON_ALNUM_PATTERN.sub('-', title).strip('-').lower()
         return safe_name[:100]  # Limit length to 100 chars
 
-    def get_local_content(self) -> Dict[str, Dict]:
-        """Get all local content with their metadata"""
+    def get_local_content(self, filenames: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        Get local content with their metadata
+        
+        Args:
+            filenames: Only read these files (without .json extension);
+                every content file is read when omitted
+                
+        Returns:
+            Dict[str, Dict]: The content and hash of each file, keyed by
+                filename without the .json extension
+        """
+        if self._hash_cache is None:
+            self._hash_cache = self._load_hash_cache()
+            
         content = {}
-        for file_path in self.content_dir.glob('*.json'):
-            try:
-                with file_path.open('r') as f:
-                    file_content = json.load(f)
-                    content[file_path.stem] = {
+        if filenames is None:
+            wanted = None
+            # Rebuilt on every full scan so entries of deleted files are dropped
+            hash_cache = {}
+        else:
+            wanted = {f"{name}.json" for name in filenames}
+            # Only the requested files are refreshed; the others keep their entries
+            hash_cache = {name: cached for name, cached in self._hash_cache.items() if name not in wanted}
+        # scandir yields names and file types without a stat per entry
+        with os.scandir(self.content_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file():
+                    continue
+                if wanted is not None and entry.name not in wanted:
+                    continue
+                try:
+                    with open(entry.path, 'rb') as f:
+                        file_content = orjson.loads(f.read())
+                    content[entry.name[:-len('.json')]] = {
                         'content': file_content,
-                        'hash': self._get_file_hash(file_path)
+                        'hash': self._get_cached_file_hash(entry, hash_cache)
                     }
-            except Exception as e:
-                logger.error(f"Failed to read content file {file_path}: {e}")
+                except Exception as e:
+                    logger.error(f"Failed to read content file {entry.path}: {e}")
+                
+        if len(hash_cache) != len(self._hash_cache):
+            self._hash_cache_dirty = True
+        self._hash_cache = hash_cache
         return content
 
+    def content_file(self, title: str) -> Path:
+        """Path of the local file a page with this title is saved to"""
+        return self.content_dir / f"{title.lower().replace(' ', '_')}.json"
+
     def save_content(self, page_id: str, content: Dict):
         """Save content to local file"""
-        logger.debug(f"Saving content for page {page_id}")  
-        logger.debug(f"Content keys: {list(content.keys())}")  
-        
-        # Ensure content directory exists
-        os.makedirs(self.content_dir, exist_ok=True)
+        logger.debug("Saving content for page %s", page_id)
         
         # Get the title for the filename
-        title = content.get('title', 'untitled').lower().replace(' ', '_')
-        filename = f"{title}.json"
-        filepath = os.path.join(self.content_dir, filename)
-        
-        logger.debug(f"Saving to file: {filepath}")  
+        filepath = self.content_file(content.get('title', 'untitled'))
+        title = filepath.stem
         
         # Extract body content
         body = content.get('body', {})
@@ -917,7 +1373,7 @@ class LocalContentManager:
             }
         else:
             body_content = {}
-            logger.debug(f"No storage content found in body: {body}")  
+            logger.debug("No storage content found for page %s", page_id)
         
         # Prepare content for saving
         save_content = {
@@ -933,35 +1389,36 @@ class LocalContentManager:
             'position': content.get('position')
         }
         
-        logger.debug(f"Final body content: {body_content}")  
+        # Both files hold the same document, so serialize it only once and
+        # write it in a single call per file
+        payload = orjson.dumps(save_content, option=orjson.OPT_INDENT_2)
         
         # Save mapping content first
-        mapping_filepath = os.path.join(self.content_dir, f"{title}_mapping.json")
-        logger.debug(f"Saving mapping to file: {mapping_filepath}")  
-        with open(mapping_filepath, 'w', encoding='utf-8') as f:
-            json.dump(save_content, f, indent=2, ensure_ascii=False)
+        mapping_filepath = self.content_dir / f"{title}_mapping.json"
+        logger.debug("Saving mapping to file: %s", mapping_filepath)
+        mapping_filepath.write_bytes(payload)
         
         # Save the main content
-        logger.debug(f"Saving main content to file: {filepath}")  
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(save_content, f, indent=2, ensure_ascii=False)
+        logger.debug("Saving main content to file: %s", filepath)
+        filepath.write_bytes(payload)
 
     def get_page_id_from_filename(self, filename: str) -> Optional[str]:
         """Get the page ID associated with a filename"""
         # Remove .json extension if present
-        filename = filename.replace('.json', '')
-        
-        # Look up the ID in our mapping
-        for page_id, mapped_filename in self.id_to_filename.items():
-            if mapped_filename == filename:
-                return page_id
-        return None
+        if filename.endswith('.json'):
+            filename = filename[:-len('.json')]
+        return self._filename_to_id.get(filename)
 
-    def _get_file_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of a file"""
+    def _get_file_hash(self, file_path: Union[str, Path]) -> str:
+        """Calculate MD5 hash of a file without reading it into memory at once"""
         try:
-            with file_path.open('rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+            with open(file_path, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                    return hashlib.file_digest(f, 'md5').hexdigest()
+                file_hash = hashlib.md5()
+                for chunk in iter(lambda: f.read(65536), b''):
+                    file_hash.update(chunk)
+                return file_hash.hexdigest()
         except Exception as e:
             logger.error(f"Failed to calculate hash for {file_path}: {e}")
             return ""
@@ -979,37 +1436,51 @@ class LocalContentManager:
                 file_path.unlink()
                 # Remove from ID mapping if present
                 page_id = self.get_page_id_from_filename(filename)
-                if page_id and page_id in self.id_to_filename:
-                    del self.id_to_filename[page_id]
-                    self._save_id_mapping()
+                if page_id:
+                    self.forget_page_id(page_id)
             except Exception as e:
                 logger.error(f"Failed to delete local file {filename}: {e}")
 
 class ContentSyncer:
-    def __init__(self):
+    def __init__(self, max_workers: int = ConfluenceAPI.MAX_WORKERS):
+        """
+        Args:
+            max_workers: Pages pushed and attachments downloaded at the same
+                time; requests beyond the session's 32 pooled connections
+                open connections that are not kept
+        """
+        self.max_workers = max_workers
         self.confluence = ConfluenceAPI()
         self.local = LocalContentManager()
         self.cache_file = self.local.cache_dir / 'sync_cache.json'
         self.deleted_pages_file = self.local.cache_dir / 'deleted_pages.json'
+        self.page_versions_file = self.local.cache_dir / 'page_versions.json'
 
     def _load_cache(self) -> Dict:
         """Load the sync cache"""
-        if self.cache_file.exists():
+        try:
             with self.cache_file.open('r') as f:
-                return json.load(f)
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load sync cache: {e}")
         return {}
 
     def _save_cache(self, cache: Dict):
         """Save the sync cache"""
-        with self.cache_file.open('w') as f:
-            json.dump(cache, f, indent=2)
+        try:
+            _write_json_atomic(self.cache_file, cache, indent=True)
+        except Exception as e:
+            logger.error(f"Failed to save sync cache: {e}")
 
     def _load_deleted_pages(self) -> set:
         """Load the set of deleted page IDs"""
         try:
-            if self.deleted_pages_file.exists():
-                with self.deleted_pages_file.open('r') as f:
-                    return set(json.load(f))
+            with self.deleted_pages_file.open('r') as f:
+                return set(orjson.loads(f.read()))
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to load deleted pages: {e}")
         return set()
@@ -1017,11 +1488,28 @@ class ContentSyncer:
     def _save_deleted_pages(self, deleted_pages: set):
         """Save the set of deleted page IDs"""
         try:
-            with self.deleted_pages_file.open('w') as f:
-                json.dump(list(deleted_pages), f)
+            _write_json_atomic(self.deleted_pages_file, list(deleted_pages))
         except Exception as e:
             logger.error(f"Failed to save deleted pages: {e}")
 
+    def _load_page_versions(self) -> Dict[str, int]:
+        """Load the last pulled version number of each page"""
+        try:
+            with self.page_versions_file.open('r') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load page versions: {e}")
+        return {}
+
+    def _save_page_versions(self, page_versions: Dict[str, int]):
+        """Save the last pulled version number of each page"""
+        try:
+            _write_json_atomic(self.page_versions_file, page_versions)
+        except Exception as e:
+            logger.error(f"Failed to save page versions: {e}")
+
     def pull_from_confluence(self):
         """Pull content from Confluence to local"""
         logger.info("Pulling content from Confluence...")
@@ -1033,50 +1521,95 @@ class ContentSyncer:
             return
 
         deleted_pages = self._load_deleted_pages()
+        page_versions = self._load_page_versions()
         
         logger.debug(f"Processing {len(space_content.get('results', []))} pages...")
-        for page in space_content.get('results', []):
-            page_id = page['id']
-            
-            # Skip pages that were deleted locally
-            if page_id in deleted_pages:
-                logger.debug(f"Skipping deleted page {page_id}")
-                continue
-                
-            try:
-                logger.debug(f"Processing page: {page.get('title', 'Untitled')} (ID: {page_id})")
-                full_page = self.confluence.get_page_by_id(page_id)
-                self.local.save_content(page_id, full_page)
+        # Attachments download in the background while the next pages are
+        # fetched; leaving the block waits for the remaining downloads. The
+        # pool is bounded so the server never sees more than max_workers
+        # downloads at once, and separate from the client's executor because
+        # each download fetches its metadata through that executor
+        with ThreadPoolExecutor(max_workers=self.max_workers) as downloads:
+            for page in space_content.get('results', []):
+                page_id = page['id']
                 
-                # Download attachments with proper error handling
+                # Skip pages that were deleted locally
+                if page_id in deleted_pages:
+                    logger.debug(f"Skipping deleted page {page_id}")
+                    continue
+                    
                 try:
-                    logger.debug(f"Getting attachments for page {page_id}...")
-                    attachments = self.confluence.get_attachments(page_id)
-                    if attachments:
-                        logger.info(f"Downloading {len(attachments)} attachments for page {page_id}")
-                        for attachment in attachments:
-                            self.confluence._download_attachment(page_id, attachment)
+                    # The listing already carries the version number, so the full
+                    # body is only fetched for pages that changed since the last
+                    # pull, or whose local file has gone missing since
+                    version = page.get('version', {}).get('number')
+                    if (version is not None and page_versions.get(page_id) == version
+                            and self.local.content_file(page.get('title', 'untitled')).exists()):
+                        logger.debug(f"Page {page_id} unchanged at version {version}, skipping body fetch")
+                    else:
+                        logger.debug(f"Processing page: {page.get('title', 'Untitled')} (ID: {page_id})")
+                        full_page = self.confluence.get_page_by_id(page_id)
+                        self.local.save_content(page_id, full_page)
+                        page_versions[page_id] = full_page.get('version', {}).get('number', version)
+                    
+                    # Download attachments with proper error handling
+                    try:
+                        logger.debug(f"Getting attachments for page {page_id}...")
+                        attachments = self.confluence.get_attachments(page_id)
+                        if attachments:
+                            logger.info(f"Downloading {len(attachments)} attachments for page {page_id}")
+                            # _download_attachment handles and logs its own failures
+                            for attachment in attachments:
+                                downloads.submit(self.confluence._download_attachment, page_id, attachment)
+                    except ConfluenceAPIError as e:
+                        logger.error(f"Failed to get attachments for page {page_id}: {e.message}")
+                        continue
+                        
                 except ConfluenceAPIError as e:
-                    logger.error(f"Failed to get attachments for page {page_id}: {e.message}")
+                    logger.error(f"Failed to get page {page_id}: {e.message}")
                     continue
-                    
-            except ConfluenceAPIError as e:
-                logger.error(f"Failed to get page {page_id}: {e.message}")
-                continue
 
+        self._save_page_versions(page_versions)
+        self.local.flush_mapping()
+        self.confluence.flush()
         logger.info("Pull completed successfully")
 
-    def push_to_confluence(self):
-        """Push local content to Confluence"""
+    def push_to_confluence(self, filenames: Optional[Iterable[str]] = None):
+        """
+        Push local content to Confluence
+        
+        Args:
+            filenames: Only push these files (without .json extension), for
+                example the ones a watcher saw change; of the pushed files,
+                those that no longer exist are deleted from Confluence. All
+                local content is pushed when omitted.
+        """
         logger.info("Pushing content to Confluence...")
-        local_content = self.local.get_local_content()
+        if filenames is not None:
+            filenames = set(filenames)
+        local_content = self.local.get_local_content(filenames)
         cache = self._load_cache()
         deleted_pages = self._load_deleted_pages()
+        # Kept to skip rewriting state files that the push did not change
+        original_cache = dict(cache)
+        original_deleted_pages = set(deleted_pages)
 
         # Check for deleted files
         cached_files = set(cache.keys())
         current_files = set(local_content.keys())
         deleted_files = cached_files - current_files
+        if filenames is not None:
+            # Files that were not looked at are not missing
+            deleted_files &= filenames
+        
+        changed = [
+            (filename, content) for filename, content in local_content.items()
+            if content['hash'] != cache.get(filename)
+        ]
+        if not changed and not deleted_files:
+            self.local.save_hash_cache()
+            logger.info("No local changes to push")
+            return
 
         # Handle deleted files
         for filename in deleted_files:
@@ -1086,71 +1619,110 @@ class ContentSyncer:
                     logger.info(f"Deleting page '{filename}' from Confluence")
                     self.confluence.delete_page(page_id)
                     deleted_pages.add(page_id)
-                    if page_id in self.local.id_to_filename:
-                        del self.local.id_to_filename[page_id]
+                    self.local.forget_page_id(page_id)
                 except ConfluenceAPIError as e:
                     logger.error(f"Failed to delete page: {e.message}")
                     continue
+            # Handled, so the next push does not see the file as deleted again
+            del cache[filename]
+
+        deleted_pages_lock = threading.Lock()
+        # Push changed content concurrently; the pages are independent
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Pushed in slices that fit the page cache: the existing pages of
+            # a slice are listed in one request up front, so their updates
+            # find the current version cached instead of each fetching it
+            batch_size = ConfluenceAPI.PAGE_CACHE_SIZE
+            for start in range(0, len(changed), batch_size):
+                batch = changed[start:start + batch_size]
+                self.confluence.prefetch_pages([
+                    content['content'].get('id') or self.local.get_page_id_from_filename(filename)
+                    for filename, content in batch
+                ])
+                futures = {
+                    pool.submit(self._push_page, filename, content, deleted_pages, deleted_pages_lock): filename
+                    for filename, content in batch
+                }
+                for future in as_completed(futures):
+                    if future.result():
+                        # Update cache with the new hash
+                        filename = futures[future]
+                        cache[filename] = local_content[filename]['hash']
 
-        # Handle existing and new content
-        for filename, content in local_content.items():
-            current_hash = content['hash']
-            cached_hash = cache.get(filename)
+        # Save updated cache and deleted pages
+        if cache != original_cache:
+            self._save_cache(cache)
+        if deleted_pages != original_deleted_pages:
+            self._save_deleted_pages(deleted_pages)
+        self.local.save_hash_cache()
+        self.local.flush_mapping()
+        logger.info("Push completed successfully")
 
-            if current_hash != cached_hash:
-                # Get the page ID from the filename or content
-                page_id = (
-                    content['content'].get('id') or 
-                    self.local.get_page_id_from_filename(filename)
-                )
-                
+    def _push_page(self, filename: str, content: Dict, deleted_pages: set,
+                   deleted_pages_lock: threading.Lock) -> bool:
+        """
+        Create or update the Confluence page of one changed local file
+        
+        Args:
+            filename: The local filename (without .json extension)
+            content: The local content entry with its hash
+            deleted_pages: IDs of pages deleted from Confluence, shared by
+                concurrent pushes and guarded by deleted_pages_lock
+            deleted_pages_lock: Lock for deleted_pages
+            
+        Returns:
+            bool: True if the page was pushed
+        """
+        # Get the page ID from the filename or content
+        page_id = (
+            content['content'].get('id') or 
+            self.local.get_page_id_from_filename(filename)
+        )
+        
+        try:
+            if page_id:
+                with deleted_pages_lock:
+                    was_deleted = page_id in deleted_pages
+                if was_deleted:
+                    # Page was previously deleted, create a new one
+                    logger.info(f"Re-creating previously deleted page '{content['content'].get('title', 'Untitled')}'")
+                    result = self.confluence.create_page(content['content'])
+                    if result and result.get('id'):
+                        content['content']['id'] = result['id']
+                        self.local.save_content(result['id'], content['content'])
+                        with deleted_pages_lock:
+                            deleted_pages.discard(page_id)
+                else:
+                    # Update existing page
+                    logger.info(f"Updating existing page '{content['content'].get('title', 'Untitled')}'")
+                    self.confluence.update_page(page_id, content['content'])
+            else:
+                # Create new page
+                logger.info(f"Creating new page '{content['content'].get('title', 'Untitled')}'")
+                result = self.confluence.create_page(content['content'])
+                if result and result.get('id'):
+                    content['content']['id'] = result['id']
+                    self.local.save_content(result['id'], content['content'])
+        
+        except ConfluenceAPIError as e:
+            if e.status_code == 404 and page_id:
+                # Page was deleted in Confluence, create it again
                 try:
-                    if page_id:
-                        if page_id in deleted_pages:
-                            # Page was previously deleted, create a new one
-                            logger.info(f"Re-creating previously deleted page '{content['content'].get('title', 'Untitled')}'")
-                            result = self.confluence.create_page(content['content'])
-                            if result and result.get('id'):
-                                content['content']['id'] = result['id']
-                                self.local.save_content(result['id'], content['content'])
-                                deleted_pages.remove(page_id)
-                        else:
-                            # Update existing page
-                            logger.info(f"Updating existing page '{content['content'].get('title', 'Untitled')}'")
-                            self.confluence.update_page(page_id, content['content'])
-                    else:
-                        # Create new page
-                        logger.info(f"Creating new page '{content['content'].get('title', 'Untitled')}'")
-                        result = self.confluence.create_page(content['content'])
-                        if result and result.get('id'):
-                            content['content']['id'] = result['id']
-                            self.local.save_content(result['id'], content['content'])
-                
-                except ConfluenceAPIError as e:
-                    if e.status_code == 404 and page_id:
-                        # Page was deleted in Confluence, create it again
-                        try:
-                            logger.info(f"Page '{content['content'].get('title', 'Untitled')}' not found in Confluence, creating new page")
-                            result = self.confluence.create_page(content['content'])
-                            if result and result.get('id'):
-                                content['content']['id'] = result['id']
-                                self.local.save_content(result['id'], content['content'])
-                                if page_id in deleted_pages:
-                                    deleted_pages.remove(page_id)
-                        except ConfluenceAPIError as create_error:
-                            logger.error(f"Failed to create page: {create_error.message}")
-                            continue
-                    else:
-                        logger.error(f"Failed to {'update' if page_id else 'create'} page: {e.message}")
-                        continue
+                    logger.info(f"Page '{content['content'].get('title', 'Untitled')}' not found in Confluence, creating new page")
+                    result = self.confluence.create_page(content['content'])
+                    if result and result.get('id'):
+                        content['content']['id'] = result['id']
+                        self.local.save_content(result['id'], content['content'])
+                        with deleted_pages_lock:
+                            deleted_pages.discard(page_id)
+                except ConfluenceAPIError as create_error:
+                    logger.error(f"Failed to create page: {create_error.message}")
+                    return False
+            else:
+                logger.error(f"Failed to {'update' if page_id else 'create'} page: {e.message}")
+                return False
                 
-                # Update cache with the new hash
-                cache[filename] = current_hash
-
-        # Save updated cache and deleted pages
-        self._save_cache(cache)
-        self._save_deleted_pages(deleted_pages)
-        logger.info("Push completed successfully")
+        return True
 
     def _download_attachment(self, page_id: str, attachment: Dict):
         """
@@ -1197,13 +1769,88 @@ class ContentSyncer:
             self.confluence._mark_failed_attachment(filename)
 
 class ContentChangeHandler(FileSystemEventHandler):
-    def __init__(self, syncer: ContentSyncer):
+    # Quiet period used by the watch command; one editor save can emit
+    # several events and saving many files emits a burst of them
+    DEBOUNCE_SECONDS = 0.5
+    # Longest the watch command lets a steady stream of events delay a push
+    MAX_DEBOUNCE_SECONDS = 2.0
+    
+    def __init__(self, syncer: ContentSyncer, debounce: float = 0.0, max_wait: Optional[float] = None):
+        """
+        Args:
+            syncer: The syncer used to push changes
+            debounce: Seconds without further changes before pushing; with
+                0 every change is pushed immediately
+            max_wait: Seconds after the first change of a burst by which it
+                is pushed even if changes keep arriving; no limit with None
+        """
         self.syncer = syncer
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self._timer: Optional[threading.Timer] = None
+        # Files changed during the pending burst (without .json extension)
+        self._pending: set = set()
+        # When the first change of the pending burst arrived
+        self._burst_start: Optional[float] = None
+        self._timer_lock = threading.Lock()
+        self._push_lock = threading.Lock()
 
     def on_modified(self, event):
-        if not event.is_directory and event.src_path.endswith('.json'):
-            logger.info(f"Change detected in {event.src_path}")
-            self.syncer.push_to_confluence()
+        if not event.is_directory:
+            self._handle_change(event.src_path)
+
+    def on_deleted(self, event):
+        # The push deletes the pages of watched files that are gone
+        if not event.is_directory:
+            self._handle_change(event.src_path)
+
+    def on_moved(self, event):
+        # A rename removes the old file and changes the new one; editors that
+        # save through a temp file and rename it only emit this event
+        if not event.is_directory:
+            self._handle_change(event.src_path, event.dest_path)
+
+    def _handle_change(self, *paths: str):
+        """Push the watched files among paths, or add them to the pending burst"""
+        filenames = set()
+        for path in paths:
+            if path.endswith('.json'):
+                logger.info(f"Change detected in {path}")
+                filenames.add(Path(path).stem)
+        if not filenames:
+            return
+        if not self.debounce:
+            self.syncer.push_to_confluence(filenames=filenames)
+            return
+            
+        # Restart the quiet period so a burst of events pushes once, but
+        # never wait past max_wait from the first event of the burst
+        with self._timer_lock:
+            now = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+            self._pending |= filenames
+            if self._burst_start is None:
+                self._burst_start = now
+            delay = self.debounce
+            if self.max_wait is not None:
+                delay = max(0.0, min(delay, self._burst_start + self.max_wait - now))
+            self._timer = threading.Timer(delay, self._push_changes)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _push_changes(self):
+        """Push the changes collected during the quiet period"""
+        with self._timer_lock:
+            self._timer = None
+            self._burst_start = None
+            filenames, self._pending = self._pending, set()
+        # A push still running from the previous burst finishes first
+        with self._push_lock:
+            try:
+                self.syncer.push_to_confluence(filenames=filenames)
+            except Exception as e:
+                logger.error(f"Failed to push changes: {e}")
 
 @click.group()
 def cli():
@@ -1226,7 +1873,11 @@ def push():
 def watch():
     """Watch for local changes and sync automatically"""
     syncer = ContentSyncer()
-    event_handler = ContentChangeHandler(syncer)
+    event_handler = ContentChangeHandler(
+        syncer,
+        debounce=ContentChangeHandler.DEBOUNCE_SECONDS,
+        max_wait=ContentChangeHandler.MAX_DEBOUNCE_SECONDS
+    )
     observer = Observer()
     
     observer.schedule(event_handler, str(syncer.local.content_dir), recursive=True)
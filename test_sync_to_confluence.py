@@ -1,35 +1,205 @@
 import os
+import gc
+import logging
+import tempfile
+import threading
+from types import SimpleNamespace
+from urllib.parse import urlsplit
 import unittest
-from unittest.mock import patch, MagicMock, call
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch, Mock, MagicMock, DEFAULT, call
 from sync_to_confluence import ConfluenceAPI, ConfluenceAPIError, LocalContentManager, ContentSyncer, ContentChangeHandler
-import requests
-import json
-from watchdog.events import FileSystemEvent
+from requests.exceptions import HTTPError
+import hashlib
+from datetime import datetime, timedelta
+import orjson
+
+def _ok_response(data, headers: dict = None) -> SimpleNamespace:
+    """
+    Build a successful response stub whose body is the JSON encoding of data
+
+    Only the attributes the API client reads are provided, which is much
+    cheaper than a MagicMock with its attribute autogeneration.
+    """
+    content = orjson.dumps(data)
+    return SimpleNamespace(
+        ok=True,
+        status_code=200,
+        content=content,
+        text=content.decode(),
+        headers=headers if headers is not None else {},
+        raise_for_status=lambda: None,
+    )
+
+def _error_response(status_code: int, text: str = '') -> SimpleNamespace:
+    """
+    Build a failed response stub whose raise_for_status raises HTTPError
+
+    A new exception is raised on every call, so no traceback is shared
+    between tests reusing the stub.
+    """
+    response = SimpleNamespace(
+        ok=False,
+        status_code=status_code,
+        content=text.encode(),
+        text=text,
+        headers={},
+        close=lambda: None,
+    )
+
+    def raise_for_status():
+        raise HTTPError(f"{status_code} Error", response=response)
+
+    response.raise_for_status = raise_for_status
+    return response
+
+class _RawResponse:
+    """
+    Successful response stub with a raw byte body, for downloads
+
+    Unlike the SimpleNamespace stubs it can be used in a with statement,
+    as streamed responses are.
+    """
+    __slots__ = ('ok', 'status_code', 'headers', 'content', 'text')
+
+    def __init__(self, content: bytes = b'', headers: dict = None):
+        self.ok = True
+        self.status_code = 200
+        self.headers = headers if headers is not None else {}
+        self.content = content
+        self.text = content.decode(errors='replace')
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _make_event(path: str, is_dir: bool = False, dest_path: Optional[str] = None) -> SimpleNamespace:
+    """Build a watchdog event stub with the attributes the handler reads"""
+    return SimpleNamespace(is_directory=is_dir, src_path=path, dest_path=dest_path)
+
+# An ADF page body, serialized once as the API returns it
+ADF_DOCUMENT = orjson.dumps({
+    'version': 1,
+    'type': 'doc',
+    'content': [
+        {
+            'type': 'paragraph',
+            'content': [{'type': 'text', 'text': 'Test content'}]
+        }
+    ]
+}).decode()
+
+# Read-only response stubs built once at import and returned by identity
+ATTACHMENT_METADATA_RESPONSES = {
+    '/wiki/api/v2/attachments/123': _ok_response({'id': '123', 'title': 'test_attachment'}),
+    '/wiki/api/v2/attachments/123/versions': _ok_response({'results': []}),
+    '/wiki/api/v2/attachments/123/labels': _ok_response({'results': []}),
+    '/wiki/api/v2/attachments/123/properties': _ok_response({'results': []}),
+}
+NOT_FOUND_RESPONSE = _error_response(404, 'Not found')
 
 class TestConfluenceAPI(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
         # Use a simpler base URL without /wiki/api/v2 since it's added in the API methods
-        os.environ['CONFLUENCE_URL'] = 'https://your-domain'
-        os.environ['CONFLUENCE_USERNAME'] = 'your_username'
-        os.environ['CONFLUENCE_API_TOKEN'] = 'your_token'
-        os.environ['CONFLUENCE_SPACE_KEY'] = 'your_space_key'
+        config = {
+            'base_url': 'https://your-domain',
+            'username': 'your_username',
+            'api_token': 'your_token',
+            'space_key': 'your_space_key',
+        }
+        # Local state goes to a directory of its own, so concurrent runs of
+        # the suite never share files and nothing is left in the checkout
+        workdir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(workdir.cleanup)
+        # The clients ContentSyncer builds still read the environment, so
+        # provide it too, but only while this class runs
+        env = patch.dict(os.environ, {
+            'CONFLUENCE_URL': config['base_url'],
+            'CONFLUENCE_USERNAME': config['username'],
+            'CONFLUENCE_API_TOKEN': config['api_token'],
+            'CONFLUENCE_SPACE_KEY': config['space_key'],
+            'LOCAL_CONTENT_DIR': os.path.join(workdir.name, 'content'),
+            'LOCAL_ATTACHMENTS_DIR': os.path.join(workdir.name, 'attachments'),
+            'LOCAL_CACHE_DIR': os.path.join(workdir.name, 'cache'),
+        })
+        env.start()
+        cls.addClassCleanup(env.stop)
+
+        # One client for the whole class; setUp resets the state tests touch
+        cls.api = ConfluenceAPI(**config)
+        cls.mock_space_id = MagicMock(return_value='test-space-id')
+        cls.local_dirs = (cls.api.local.content_dir, cls.api.local.attachments_dir, cls.api.local.cache_dir)
+        cls.id_map_file = cls.api.local.id_map_file
+
+        # Patch the session verbs once for the class; setUp resets them
+        patcher = patch.multiple('sync_to_confluence.requests.Session',
+                                 get=DEFAULT, put=DEFAULT, post=DEFAULT, delete=DEFAULT)
+        for verb, mock in patcher.start().items():
+            setattr(cls, f'mock_{verb}', mock)
+        cls.addClassCleanup(patcher.stop)
+        # Retry and polling waits never block a test
+        patcher = patch('sync_to_confluence.time.sleep')
+        cls.mock_sleep = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        # The client logs at DEBUG; only errors are asserted on here, so skip
+        # building the records for everything below
+        logging.disable(logging.WARNING)
+        cls.addClassCleanup(logging.disable, logging.NOTSET)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.api.session.close()
 
     def setUp(self):
-        self.api = ConfluenceAPI()
+        api = self.api
         # Mock get_space_id to avoid that dependency in all tests
-        self.api.get_space_id = MagicMock(return_value='test-space-id')
-        # Ensure the content directory exists
-        if not self.api.local.content_dir.exists():
-            self.api.local.content_dir.mkdir(parents=True)
-
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_attachments(self, mock_get):
+        api.get_space_id = self.mock_space_id
+        self.mock_space_id.reset_mock()
+        api.local.content_dir, api.local.attachments_dir, api.local.cache_dir = self.local_dirs
+        # The client's LocalContentManager doubles as the one local tests use
+        api.local.id_map_file = self.id_map_file
+        api.local.id_to_filename = {}
+        api.local._mapping_dirty = False
+        api._space_id = None
+        api._page_cache.clear()
+        api._failed_attachments = None
+        api._failed_attachments_dirty = False
+        api._download_url_variant = None
+        api._created_dirs.clear()
+        for mock in (self.mock_get, self.mock_put, self.mock_post, self.mock_delete, self.mock_sleep):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+    def test_create_session_pooling(self):
+        adapter = self.api.session.get_adapter('https://your-domain')
+        # One pool for the single Confluence host, reused by every request
+        self.assertEqual(adapter._pool_connections, 1)
+        self.assertIs(self.api.session.get_adapter('https://your-domain/wiki/api/v2/pages'), adapter)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertIn('PUT', adapter.max_retries.allowed_methods)
+        self.assertNotIn('POST', adapter.max_retries.allowed_methods)
+        self.assertTrue(adapter.max_retries.respect_retry_after_header)
+        self.assertEqual(adapter.max_retries.backoff_jitter, 0.3)
+
+    def test_get_attachments(self):
         # Mock the response with proper _links structure
-        mock_response = MagicMock()
-        mock_response.ok = True
-        mock_response.json.return_value = {
+        mock_response = _ok_response({
             'results': [{
                 'id': '123',
                 'title': 'test_attachment',
@@ -38,57 +208,49 @@ class TestConfluenceAPI(unittest.TestCase):
                 }
             }],
             'size': 1  # Add size to indicate total results
-        }
-        # Mock the headers without a next link since we only want one page
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
+        })
+        # No Link header, so there is only one page
+        self.mock_get.return_value = mock_response
 
         attachments = self.api.get_attachments(page_id="12345", media_type="image/png", limit=1)
         self.assertEqual(len(attachments), 1)
         self.assertEqual(attachments[0]['title'], 'test_attachment')
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_attachment_metadata(self, mock_get):
-        # Mock the response for each API call
-        mock_responses = {
-            '/wiki/api/v2/attachments/123': {
-                'id': '123',
-                'title': 'test_attachment'
-            },
-            '/wiki/api/v2/attachments/123/versions': {
-                'results': []
-            },
-            '/wiki/api/v2/attachments/123/labels': {
-                'results': []
-            },
-            '/wiki/api/v2/attachments/123/properties': {
-                'results': []
-            }
-        }
+    def test_get_attachments_follows_next_link(self):
+        first_page = _ok_response({'results': [{'id': '1', 'title': 'first'}]}, headers={
+            'Link': '</wiki/api/v2/pages/12345/attachments?cursor=abc>; rel="next"'
+        })
+        second_page = _ok_response({'results': [{'id': '2', 'title': 'second'}]})
+        self.mock_get.side_effect = [first_page, second_page]
+
+        attachments = self.api.get_attachments(page_id="12345")
 
+        self.assertEqual([a['id'] for a in attachments], ['1', '2'])
+        self.assertEqual(
+            self.mock_get.call_args[0][0],
+            'https://your-domain/wiki/api/v2/pages/12345/attachments?cursor=abc'
+        )
+        self.assertEqual(self.mock_get.call_args[1]['params'], {})
+
+    def test_get_attachment_metadata(self):
         def mock_get_response(*args, **kwargs):
-            # Find the matching URL in mock_responses
+            # Route on the exact path; a substring match would send every
+            # sub-resource to the attachment itself
             url = args[0] if args else kwargs.get('url', '')
-            for endpoint, response_data in mock_responses.items():
-                if endpoint in url:
-                    mock_response = MagicMock()
-                    mock_response.ok = True
-                    mock_response.json.return_value = response_data
-                    return mock_response
-            return MagicMock(ok=False)
+            return ATTACHMENT_METADATA_RESPONSES.get(urlsplit(url).path, NOT_FOUND_RESPONSE)
 
-        mock_get.side_effect = mock_get_response
+        self.mock_get.side_effect = mock_get_response
 
         metadata = self.api.get_attachment_metadata(attachment_id="123")
         self.assertEqual(metadata['title'], 'test_attachment')
+        self.assertEqual(metadata['versions'], [])
+        self.assertEqual(metadata['labels'], [])
+        self.assertEqual(metadata['properties'], [])
+        self.assertEqual(self.mock_get.call_count, 4)
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_download_attachment(self, mock_get):
+    def test_download_attachment(self):
         # Mock the response with proper content
-        mock_response = MagicMock()
-        mock_response.ok = True
-        mock_response.content = b'Test content'
-        mock_get.return_value = mock_response
+        self.mock_get.return_value = _RawResponse(b'Test content')
 
         attachment = {
             'id': '123',
@@ -98,60 +260,176 @@ class TestConfluenceAPI(unittest.TestCase):
             }
         }
 
-        content = self.api.download_attachment(page_id="12345", attachment=attachment)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.cache_dir = Path(tmp_dir)
+            content = self.api.download_attachment(page_id="12345", attachment=attachment)
         self.assertEqual(content, b'Test content')
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_attachments_error(self, mock_get):
-        # Mock an error response
-        mock_response = MagicMock()
-        mock_response.ok = False
-        mock_response.status_code = 404
-        mock_response.text = "Not found"
-        mock_response.headers = {}
-        # Configure the mock to raise an exception
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
-            "404 Client Error: Not Found for url: test_url",
-            response=mock_response
-        )
-        mock_get.return_value = mock_response
+    def test_download_attachment_remembers_url_variant(self):
+        not_found = _error_response(404)
+        found = _RawResponse(b'Test content')
+        # Only the /wiki-prefixed URL serves attachments on this instance
+        self.mock_get.side_effect = lambda url, **kwargs: found if '/wiki/download/' in url else not_found
 
-        with self.assertRaises(ConfluenceAPIError):
-            self.api.get_attachments(page_id="12345")
+        attachment = {
+            'id': '123',
+            'title': 'test_attachment',
+            '_links': {
+                'download': '/download/attachments/12345/test_attachment'
+            }
+        }
 
-    @patch('sync_to_confluence.requests.get')
-    def test_logging_on_error(self, mock_get):
-        # Mock an error response
-        mock_get.return_value.ok = False
-        mock_get.return_value.status_code = 500
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.cache_dir = Path(tmp_dir)
+            self.assertEqual(self.api.download_attachment('12345', attachment), b'Test content')
+            self.assertEqual(self.mock_get.call_count, 2)
+            # The variant is stored per instance, like the space IDs
+            self.assertEqual(orjson.loads((Path(tmp_dir) / 'download_url_variants.json').read_bytes()),
+                             {self.api.base_url: 'wiki'})
+
+            # The working variant is tried first from now on, also after a restart
+            self.mock_get.reset_mock()
+            api = ConfluenceAPI(session=self.api.session)
+            api.local.cache_dir = Path(tmp_dir)
+            api._download_url_variant = api._load_download_url_variants().get(api.base_url)
+            self.assertEqual(api.download_attachment('12345', attachment), b'Test content')
+            self.mock_get.assert_called_once()
+
+    def test_download_attachment_error_not_retried_per_url(self):
+        # Retries happen inside the session; a non-404 error ends the download
+        self.mock_get.return_value = _error_response(500, 'Server error')
 
-        with self.assertRaises(ConfluenceAPIError):
-            self.api.get_attachments(page_id="12345")
+        attachment = {
+            'id': '123',
+            'title': 'test_attachment',
+            '_links': {
+                'download': '/download/attachments/12345/test_attachment'
+            }
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.cache_dir = Path(tmp_dir)
+            with self.assertRaises(ConfluenceAPIError):
+                self.api.download_attachment('12345', attachment)
+        self.mock_get.assert_called_once()
+
+    @patch.object(ConfluenceAPI, '_save_attachment_metadata')
+    def test_download_attachment_streams_to_disk(self, mock_save_metadata):
+        self.mock_get.return_value = _RawResponse(b'Test content', headers={'Content-Length': '12'})
+
+        attachment = {
+            'id': '123',
+            'title': 'test_attachment',
+            '_links': {
+                'download': '/download/attachments/12345/test_attachment'
+            }
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.attachments_dir = Path(tmp_dir)
+            self.api.local.cache_dir = Path(tmp_dir)
+            self.api._download_attachment('12345', attachment)
+
+            file_path = Path(tmp_dir) / '12345' / 'test_attachment'
+            self.assertEqual(file_path.read_bytes(), b'Test content')
+            self.assertEqual(os.listdir(file_path.parent), ['test_attachment'])
+
+        self.assertTrue(self.mock_get.call_args[1]['stream'])
+        mock_save_metadata.assert_called_once_with('12345', attachment)
+
+    @patch('pathlib.Path.mkdir')
+    def test_ensure_dir_creates_once(self, mock_mkdir):
+        directory = Path('attachments') / '12345'
+        self.api._ensure_dir(directory)
+        self.api._ensure_dir(directory)
+        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+
+    @patch.object(ConfluenceAPI, 'get_attachment_metadata')
+    def test_save_attachment_metadata_written_in_background(self, mock_get_metadata):
+        mock_get_metadata.return_value = {'id': '123', 'title': 'test_attachment', 'versions': []}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.attachments_dir = Path(tmp_dir)
+            self.api._save_attachment_metadata('12345', {'id': '123', 'title': 'test_attachment'})
+            self.api.flush()
+
+            metadata_file = Path(tmp_dir) / '12345' / '.metadata' / 'test_attachment.json'
+            self.assertEqual(orjson.loads(metadata_file.read_bytes()), mock_get_metadata.return_value)
+
+    def test_queued_write_error_keeps_writer(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            failing = Path(tmp_dir) / 'failing.json'
+            written = Path(tmp_dir) / 'written.json'
+            # Data that is not bytes fails with a TypeError, not an OSError
+            self.api._queue_write(failing, 'not bytes')
+            self.api._queue_write(written, b'{}')
+
+            self.api.flush()
+
+            self.assertFalse(failing.exists())
+            self.assertEqual(written.read_bytes(), b'{}')
+
+    @patch.object(ConfluenceAPI, '_mark_failed_attachment')
+    def test_download_attachment_truncated(self, mock_mark_failed):
+        self.mock_get.return_value = _RawResponse(b'Test content', headers={'Content-Length': '100'})
+
+        attachment = {
+            'id': '123',
+            'title': 'test_attachment',
+            '_links': {
+                'download': '/download/attachments/12345/test_attachment'
+            }
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.attachments_dir = Path(tmp_dir)
+            self.api.local.cache_dir = Path(tmp_dir)
+            self.api._download_attachment('12345', attachment)
+
+            # Neither the attachment nor its partial download is left behind
+            self.assertEqual(os.listdir(Path(tmp_dir) / '12345'), [])
+
+        mock_mark_failed.assert_called_once_with('test_attachment')
+
+    def test_upload_attachment_streams_multipart(self):
+        mock_response = _ok_response({'id': 'att1', 'title': 'upload.bin'})
+        self.mock_post.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / 'upload.bin'
+            file_path.write_bytes(b'x' * 1024)
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_page_by_id(self, mock_get):
+            result = self.api.upload_attachment('12345', file_path)
+
+        self.assertEqual(result['id'], 'att1')
+        kwargs = self.mock_post.call_args[1]
+        self.assertTrue(kwargs['headers']['Content-Type'].startswith('multipart/form-data'))
+        self.assertEqual(kwargs['headers']['X-Atlassian-Token'], 'nocheck')
+        # The file handle is closed once the request has been sent
+        self.assertTrue(kwargs['data'].fields['file'][1].closed)
+
+    def test_get_attachments_error(self):
+        for status_code, text in ((404, "Not found"), (500, "Server error")):
+            with self.subTest(status_code=status_code):
+                self.mock_get.return_value = _error_response(status_code, text)
+
+                with self.assertLogs('sync_to_confluence', level='ERROR') as logs:
+                    with self.assertRaises(ConfluenceAPIError):
+                        self.api.get_attachments(page_id="12345")
+                self.assertIn(f'{status_code} - {text}', logs.output[0])
+
+    def test_get_page_by_id(self):
         # Mock the response for the get_page_by_id method
-        mock_response = MagicMock()
-        mock_response.ok = True
-        mock_response.json.return_value = {
+        mock_response = _ok_response({
             'id': '123',
             'title': 'Test Page',
             'body': {
                 'representation': 'atlas_doc_format',
-                'value': json.dumps({
-                    'version': 1,
-                    'type': 'doc',
-                    'content': [
-                        {
-                            'type': 'paragraph',
-                            'content': [{'type': 'text', 'text': 'Test content'}]
-                        }
-                    ]
-                })
+                'value': ADF_DOCUMENT,
             },
             'version': {'number': 1}
-        }
-        mock_get.return_value = mock_response
+        })
+        self.mock_get.return_value = mock_response
 
         # Call the method
         page = self.api.get_page_by_id('123')
@@ -162,16 +440,55 @@ class TestConfluenceAPI(unittest.TestCase):
         self.assertIsNotNone(page['body'])
         self.assertEqual(page['version']['number'], 1)
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_space_content(self, mock_get):
+    def test_get_page_by_id_cached(self):
+        mock_response = _ok_response({'id': '123', 'version': {'number': 1}})
+        self.mock_get.return_value = mock_response
+
+        self.assertEqual(self.api.get_page_by_id('123')['id'], '123')
+        self.assertEqual(self.api.get_page_by_id('123')['id'], '123')
+        self.assertEqual(self.mock_get.call_count, 1)
+
+        # Writes drop the cached copy
+        self.api.delete_page('123')
+        self.api.get_page_by_id('123')
+        self.assertEqual(self.mock_get.call_count, 2)
+
+        # Entries expire after PAGE_CACHE_TTL seconds
+        with patch('sync_to_confluence.time.monotonic', return_value=float('inf')):
+            self.api.get_page_by_id('123')
+        self.assertEqual(self.mock_get.call_count, 3)
+
+    def test_prefetch_pages(self):
+        self.mock_get.return_value = _ok_response({'results': [
+            {'id': '1', 'version': {'number': 3}, 'spaceId': 'test-space-id'},
+            {'id': '2', 'version': {'number': 5}, 'spaceId': 'test-space-id'},
+        ]})
+
+        # Missing IDs and duplicates are left out of the listing request
+        self.assertEqual(self.api.prefetch_pages(['1', None, '2', '1']), 2)
+        self.mock_get.assert_called_once()
+        self.assertEqual(self.mock_get.call_args[1]['params']['id'], '1,2')
+
+        # The listed pages are served from the cache
+        self.assertEqual(self.api.get_page_by_id('2')['version']['number'], 5)
+        self.mock_get.assert_called_once()
+
+        # A failed listing is not fatal; the pages are fetched one by one later
+        self.mock_get.return_value = _error_response(500)
+        self.assertEqual(self.api.prefetch_pages(['3']), 0)
+
+    def test_get_page_by_id_invalid_json(self):
+        self.mock_get.return_value = _RawResponse(b'<html>Service unavailable</html>')
+
+        with self.assertRaises(ConfluenceAPIError):
+            self.api.get_page_by_id('123')
+
+    def test_get_space_content(self):
         # Mock the space_id
         self.api.get_space_id = MagicMock(return_value='space-123')
 
         # Mock the response for the get_space_content method
-        mock_response = MagicMock()
-        mock_response.ok = True
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _ok_response({
             'results': [
                 {
                     'id': '1',
@@ -195,45 +512,94 @@ class TestConfluenceAPI(unittest.TestCase):
                 'base': 'https://your-domain/wiki/rest/api',
                 'context': '/wiki'
             }
-        }
-        mock_get.return_value = mock_response
+        })
+        self.mock_get.return_value = mock_response
 
         # Call the method
         content = self.api.get_space_content()
 
         # Assertions
-        self.assertEqual(len(content['results']), 2)
-        self.assertEqual(mock_get.call_count, 2)  # Updated to assert called twice
-        self.assertEqual(content['results'][0]['title'], 'Page 1')
-        self.assertEqual(content['results'][1]['title'], 'Page 2')
-
-    @patch('sync_to_confluence.requests.Session.get')
-    @patch('sync_to_confluence.requests.Session.put')
-    def test_update_page(self, mock_put, mock_get):
+        self.assertEqual([(page['id'], page['title']) for page in content['results']],
+                         [('1', 'Page 1'), ('2', 'Page 2')])
+        self.assertEqual(self.mock_get.call_count, 1)  # Space lookup goes through get_space_id
+        # The listing does not ask for page bodies
+        params = self.mock_get.call_args[1]['params']
+        self.assertEqual(params['space-id'], 'space-123')
+        self.assertNotIn('body-format', params)
+        self.assertNotIn('expand', params)
+
+    def test_get_space_content_with_space_id(self):
+        self.api.get_space_id = MagicMock()
+        mock_response = _ok_response({'results': [{'id': '1', 'title': 'Page 1'}]})
+        self.mock_get.return_value = mock_response
+
+        content = self.api.get_space_content(space_id='space-456')
+
+        self.assertEqual(content['results'][0]['id'], '1')
+        self.api.get_space_id.assert_not_called()
+        self.assertEqual(self.mock_get.call_args[1]['params']['space-id'], 'space-456')
+
+    def test_get_space_id_cached(self):
+        mock_response = _ok_response({
+            'results': [{'id': 'space-123', 'key': 'your_space_key'}]
+        })
+        self.mock_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            api = ConfluenceAPI(session=self.api.session)
+            api.local.cache_dir = Path(tmp_dir)
+            self.assertEqual(api.get_space_id(), 'space-123')
+            self.assertEqual(api.get_space_id(), 'space-123')
+            self.assertEqual(self.mock_get.call_count, 1)
+
+            # A fresh instance reuses the persisted ID without a request
+            api = ConfluenceAPI(session=self.api.session)
+            api.local.cache_dir = Path(tmp_dir)
+            self.assertIs(api.session, self.api.session)
+            self.assertEqual(api.get_space_id(), 'space-123')
+            self.assertEqual(self.mock_get.call_count, 1)
+
+    def test_get_space_id_concurrent(self):
+        mock_response = _ok_response({
+            'results': [{'id': 'space-123', 'key': 'your_space_key'}]
+        })
+
+        def slow_get(url, **kwargs):
+            # Keep the lookup running while the other pushes ask for the ID
+            threading.Event().wait(0.05)
+            return mock_response
+        self.mock_get.side_effect = slow_get
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            api = ConfluenceAPI(session=self.api.session)
+            api.local.cache_dir = Path(tmp_dir)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                space_ids = list(pool.map(lambda _: api.get_space_id(), range(4)))
+
+        self.assertEqual(space_ids, ['space-123'] * 4)
+        self.mock_get.assert_called_once()
+
+    def test_update_page(self):
         # Mock get_space_id to return the same space ID
         self.api.get_space_id = MagicMock(return_value='test-space-id')
 
         # Mock the response for the get_page_by_id method
-        mock_response_get = MagicMock()
-        mock_response_get.ok = True
-        mock_response_get.json.return_value = {
+        mock_response_get = _ok_response({
             'id': '123',
             'title': 'Existing Page',
             'body': {'storage': {'value': '<p>Existing content</p>'}},
             'version': {'number': 1},
             'spaceId': 'test-space-id'  # Same as what get_space_id returns
-        }
-        mock_get.return_value = mock_response_get
+        })
+        self.mock_get.return_value = mock_response_get
 
         # Mock the response for the update_page method
-        mock_response_put = MagicMock()
-        mock_response_put.ok = True
-        mock_response_put.json.return_value = {
+        mock_response_put = _ok_response({
             'id': '123',
             'title': 'Updated Page',
             'version': {'number': 2}
-        }
-        mock_put.return_value = mock_response_put
+        })
+        self.mock_put.return_value = mock_response_put
 
         # Prepare the content to update
         content = {
@@ -251,88 +617,66 @@ class TestConfluenceAPI(unittest.TestCase):
         self.assertEqual(updated_page['version']['number'], 2)
 
         # Verify the update request doesn't include spaceId or status change
-        mock_put.assert_called_once()
-        update_data = mock_put.call_args[1]['json']
+        self.mock_put.assert_called_once()
+        update_data = orjson.loads(self.mock_put.call_args[1]['data'])
         self.assertNotIn('spaceId', update_data)
         self.assertEqual(update_data['status'], 'current')
 
-    @patch('sync_to_confluence.requests.Session.get')
-    @patch('sync_to_confluence.requests.Session.put')
-    def test_update_page_different_space(self, mock_put, mock_get):
-        """Test moving a page to a different space"""
-        # Mock successful page retrieval
-        def get_page_response():
-            mock_response = MagicMock()
-            mock_response.ok = True
-            mock_response.json.return_value = {
-                'id': '12345',
-                'version': {'number': 1},
-                'title': 'Test Page',
-                'spaceId': 'old-space-id',
-                'status': 'draft'  # Set initial status to draft
-            }
-            return mock_response
+    @staticmethod
+    def _page_response(space_id: str = 'old-space-id', status: str = 'current') -> SimpleNamespace:
+        """Build the GET response for page 12345 at version 1 in space_id"""
+        return _ok_response({
+            'id': '12345',
+            'version': {'number': 1},
+            'title': 'Test Page',
+            'spaceId': space_id,
+            'status': status
+        })
 
-        mock_get.return_value = get_page_response()
+    def test_update_page_draft_conversion_backoff(self):
+        """Test the draft status poll backs off from a short first wait"""
+        # The draft status shows up on the second check
+        self.mock_get.side_effect = [
+            self._page_response(), self._page_response(), self._page_response(status='draft')
+        ]
 
-        # Mock successful page update
-        mock_put_response = MagicMock()
-        mock_put_response.ok = True
-        mock_put_response.json.return_value = {
-            'id': '12345',
-            'version': {'number': 2},
-            'title': 'Updated Test Page'
-        }
-        mock_put.return_value = mock_put_response
+        mock_put_response = _ok_response({'id': '12345', 'version': {'number': 2}})
+        self.mock_put.return_value = mock_put_response
 
-        # Mock get_space_id to return a different space ID
         self.api.get_space_id = MagicMock(return_value='new-space-id')
 
-        content = {
-            'title': 'Updated Test Page',
-            'body': {'storage': {'value': 'Updated content'}}
-        }
+        self.api.update_page(page_id='12345', content={'title': 'Test Page'})
 
-        result = self.api.update_page(page_id='12345', content=content)
+        self.assertEqual(self.mock_sleep.call_args_list, [call(0.2), call(0.4)])
+        self.assertEqual(self.mock_put.call_count, 2)
 
-        # Verify the result
-        self.assertEqual(result['id'], '12345')
-        self.assertEqual(result['version']['number'], 2)
-        self.assertEqual(result['title'], 'Updated Test Page')
+    def test_update_page_draft_conversion_gives_up(self):
+        """Test the draft status poll stops after its last backoff step"""
+        self.mock_get.return_value = self._page_response()
+        self.mock_put.return_value = _ok_response({'id': '12345', 'version': {'number': 2}})
+        self.api.get_space_id = MagicMock(return_value='new-space-id')
 
-    @patch('sync_to_confluence.requests.Session.get')
-    @patch('sync_to_confluence.requests.Session.put')
-    def test_update_page_space_move_error(self, mock_put, mock_get):
+        with self.assertRaisesRegex(ConfluenceAPIError, "after 4 attempts"):
+            self.api.update_page(page_id='12345', content={'title': 'Test Page'})
+
+        self.assertEqual(self.mock_sleep.call_args_list, [call(0.2), call(0.4), call(0.8), call(1.6)])
+        # Only the draft conversion was sent, never the move itself
+        self.mock_put.assert_called_once()
+
+    def test_update_page_space_move_error(self):
         """Test error handling when moving a page between spaces"""
-        # Mock successful page retrieval
-        mock_get_response = MagicMock()
-        mock_get_response.ok = True
-        mock_get_response.json.return_value = {
-            'id': '12345',
-            'version': {'number': 1},
-            'title': 'Test Page',
-            'spaceId': 'old-space-id',
-            'status': 'current'  # Set initial status to current
-        }
-        mock_get.return_value = mock_get_response
+        # Mock successful retrieval of a page that is not a draft
+        self.mock_get.return_value = self._page_response()
 
-        # Mock error response for non-draft page move
-        mock_error_response = MagicMock()
-        mock_error_response.ok = False
-        mock_error_response.status_code = 400
-        mock_error_response.text = json.dumps({
+        # The server refuses to move a page that is not a draft
+        self.mock_put.return_value = _error_response(400, orjson.dumps({
             "errors": [{
                 "status": 400,
                 "code": "BAD_REQUEST",
                 "title": "Only DRAFT pages can be moved between spaces using the Update API.",
                 "detail": None
             }]
-        })
-        mock_error = requests.exceptions.HTTPError(
-            "400 Client Error",
-            response=mock_error_response
-        )
-        mock_put.side_effect = mock_error
+        }).decode())
 
         # Mock get_space_id to return a different space ID
         self.api.get_space_id = MagicMock(return_value='new-space-id')
@@ -342,153 +686,185 @@ class TestConfluenceAPI(unittest.TestCase):
             'body': {'storage': {'value': 'Updated content'}}
         }
 
-        with self.assertRaises(ConfluenceAPIError) as context:
+        with self.assertRaisesRegex(ConfluenceAPIError, "Failed to convert page 12345 to draft"):
             self.api.update_page(page_id='12345', content=content)
 
-        self.assertIn("Failed to convert page 12345 to draft", str(context.exception))
-
-    @patch('sync_to_confluence.requests.Session.get')
-    @patch('sync_to_confluence.requests.Session.put')
-    def test_update_page_same_space(self, mock_put, mock_get):
-        """Test updating a page within the same space"""
-        # Mock successful page retrieval
-        mock_get_response = MagicMock()
-        mock_get_response.ok = True
-        mock_get_response.json.return_value = {
-            'id': '12345',
-            'version': {'number': 1},
-            'title': 'Test Page',
-            'spaceId': 'test-space-id'  # Same as what get_space_id returns
-        }
-        mock_get.return_value = mock_get_response
-
-        # Mock successful page update
-        mock_put_response = MagicMock()
-        mock_put_response.ok = True
-        mock_put_response.json.return_value = {
-            'id': '12345',
-            'version': {'number': 2},
-            'title': 'Updated Test Page'
-        }
-        mock_put.return_value = mock_put_response
-
+    def test_update_page_space(self):
+        """Test updating a page within its space and moving a draft to another space"""
         content = {
             'title': 'Updated Test Page',
             'body': {'storage': {'value': 'Updated content'}}
         }
+        self.mock_put.return_value = _ok_response({
+            'id': '12345',
+            'version': {'number': 2},
+            'title': 'Updated Test Page'
+        })
 
-        result = self.api.update_page(page_id='12345', content=content)
-
-        # Verify the result
-        self.assertEqual(result['id'], '12345')
-        self.assertEqual(result['version']['number'], 2)
-        self.assertEqual(result['title'], 'Updated Test Page')
-
-    @patch('sync_to_confluence.requests.Session.get')
-    @patch('sync_to_confluence.requests.Session.put')
-    def test_update_page(self, mock_put, mock_get):
-        # Mock get_space_id to return the same space ID
-        self.api.get_space_id = MagicMock(return_value='test-space-id')
-
-        # Mock the response for the get_page_by_id method
-        mock_response_get = MagicMock()
-        mock_response_get.ok = True
-        mock_response_get.json.return_value = {
-            'id': '123',
-            'title': 'Existing Page',
-            'body': {'storage': {'value': '<p>Existing content</p>'}},
-            'version': {'number': 1},
-            'spaceId': 'test-space-id'  # Same as what get_space_id returns
-        }
-        mock_get.return_value = mock_response_get
-
-        # Mock the response for the update_page method
-        mock_response_put = MagicMock()
-        mock_response_put.ok = True
-        mock_response_put.json.return_value = {
-            'id': '123',
-            'title': 'Updated Page',
-            'version': {'number': 2}
-        }
-        mock_put.return_value = mock_response_put
-
-        # Prepare the content to update
-        content = {
-            'title': 'Updated Page',
-            'body': {'storage': {'value': '<p>Updated content</p>'}},
-            'version': {'number': 2}
-        }
-
-        # Call the method
-        updated_page = self.api.update_page('123', content)
-
-        # Verify the result
-        self.assertEqual(updated_page['id'], '123')
-        self.assertEqual(updated_page['title'], 'Updated Page')
-        self.assertEqual(updated_page['version']['number'], 2)
-
-        # Verify the update request doesn't include spaceId or status change
-        mock_put.assert_called_once()
-        update_data = mock_put.call_args[1]['json']
-        self.assertNotIn('spaceId', update_data)
-        self.assertEqual(update_data['status'], 'current')
-
-    @patch('pathlib.Path.exists')
-    @patch('pathlib.Path.open', new_callable=unittest.mock.mock_open)
-    def test_load_id_mapping(self, mock_open, mock_exists):
-        # Setup mock data
-        mock_data = '{"123": "new-page"}'
-        mock_open.return_value.read.return_value = mock_data
-        mock_exists.return_value = True
-
-        # Create an instance of LocalContentManager
-        local_manager = LocalContentManager()
-
-        # Reset the mock to clear the initialization call
-        mock_open.reset_mock()
-        
-        # Call the method to load the ID mapping
-        mapping = local_manager._load_id_mapping()
-
-        # Assertions
-        expected_mapping = {"123": "new-page"}
-        self.assertEqual(mapping, expected_mapping)
-
-        # Verify that the file was opened correctly
-        mock_open.assert_called_once_with('r')
-
-    @patch('pathlib.Path.exists')
-    @patch('pathlib.Path.unlink')
-    @patch('pathlib.Path.open', new_callable=unittest.mock.mock_open)
-    def test_delete_local_content(self, mock_open, mock_unlink, mock_exists):
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_data = '{"123": "new-page"}'
-        mock_open.return_value.read.return_value = mock_data
-
-        # Create an instance of LocalContentManager
-        local_manager = LocalContentManager()
-
-        # Reset mock to clear initialization calls
-        mock_open.reset_mock()
-        mock_exists.reset_mock()
-
-        # Setup the ID mapping
-        local_manager.id_to_filename = {"123": "new-page"}
-
-        # Call the delete method
-        filename = "new-page"
-        local_manager.delete_local_content(filename)
-
-        # Verify the file operations
-        mock_exists.assert_called_with()
-        mock_unlink.assert_called_once()
-        
-        # Verify that the ID mapping has been updated
-        self.assertNotIn("123", local_manager.id_to_filename)
+        # (current page spaceId, current page status, target space ID, expected spaceId in the update)
+        cases = [
+            ('test-space-id', 'current', 'test-space-id', None),
+            ('old-space-id', 'draft', 'new-space-id', 'new-space-id'),
+        ]
+        for current_space, status, target_space, expected_space in cases:
+            with self.subTest(current_space=current_space, target_space=target_space):
+                self.api._page_cache.clear()
+                self.mock_put.reset_mock()
+                self.mock_get.return_value = self._page_response(current_space, status)
+                self.api.get_space_id = MagicMock(return_value=target_space)
+
+                result = self.api.update_page(page_id='12345', content=content)
+
+                self.assertEqual(result['id'], '12345')
+                self.assertEqual(result['version']['number'], 2)
+                self.assertEqual(result['title'], 'Updated Test Page')
+                # A draft is moved in a single update; nothing has to be converted first
+                self.mock_put.assert_called_once()
+                update_data = orjson.loads(self.mock_put.call_args[1]['data'])
+                self.assertEqual(update_data.get('spaceId'), expected_space)
+
+    def _local_state_env(self, tmp_dir: str):
+        """Point new LocalContentManagers at content and cache dirs inside tmp_dir"""
+        return patch.dict(os.environ, {
+            'LOCAL_CONTENT_DIR': os.path.join(tmp_dir, 'content'),
+            'LOCAL_CACHE_DIR': os.path.join(tmp_dir, 'cache'),
+        })
 
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_save_content(self, mock_open):
+    def _make_syncer(self, state_dir: str, **kwargs) -> ContentSyncer:
+        """Build a ContentSyncer whose sync state files live in state_dir"""
+        syncer = ContentSyncer(**kwargs)
+        syncer.cache_file = Path(state_dir) / 'sync_cache.json'
+        syncer.deleted_pages_file = Path(state_dir) / 'deleted_pages.json'
+        syncer.page_versions_file = Path(state_dir) / 'page_versions.json'
+        return syncer
+
+    def test_load_id_mapping(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, self._local_state_env(tmp_dir):
+            id_map_file = Path(tmp_dir) / 'cache' / 'id_mapping.json'
+            id_map_file.parent.mkdir()
+            id_map_file.write_bytes(orjson.dumps({"123": "new-page"}))
+
+            # The mapping is loaded when the manager is created
+            local_manager = LocalContentManager()
+            self.assertEqual(local_manager.id_to_filename, {"123": "new-page"})
+            self.assertEqual(local_manager.get_page_id_from_filename("new-page"), "123")
+
+            # A missing mapping file is an empty mapping
+            id_map_file.unlink()
+            self.assertEqual(local_manager._load_id_mapping(), {})
+
+    def test_delete_local_content(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, self._local_state_env(tmp_dir):
+            id_map_file = Path(tmp_dir) / 'cache' / 'id_mapping.json'
+            id_map_file.parent.mkdir()
+            id_map_file.write_bytes(orjson.dumps({"123": "new-page"}))
+            local_manager = LocalContentManager()
+            content_file = local_manager.content_dir / 'new-page.json'
+            content_file.write_bytes(b'{}')
+
+            # Call the delete method
+            local_manager.delete_local_content("new-page")
+
+            # The file is gone and the ID mapping has been updated
+            self.assertFalse(content_file.exists())
+            self.assertNotIn("123", local_manager.id_to_filename)
+            self.assertIsNone(local_manager.get_page_id_from_filename("new-page.json"))
+
+            # The mapping file is only rewritten on flush, and only once
+            self.assertEqual(orjson.loads(id_map_file.read_bytes()), {"123": "new-page"})
+            with patch('sync_to_confluence.os.replace', wraps=os.replace) as mock_replace:
+                local_manager.flush_mapping()
+                local_manager.flush_mapping()
+            mock_replace.assert_called_once()
+            self.assertEqual(orjson.loads(id_map_file.read_bytes()), {})
+
+    def test_get_file_hash(self):
+        local_manager = self.api.local
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / 'page.json'
+            file_path.write_bytes(b'x' * 200000)
+            self.assertEqual(local_manager._get_file_hash(file_path), hashlib.md5(b'x' * 200000).hexdigest())
+            file_path.write_bytes(b'{}')
+            self.assertEqual(local_manager._get_file_hash(file_path), hashlib.md5(b'{}').hexdigest())
+            self.assertEqual(local_manager._get_file_hash(Path(tmp_dir) / 'missing.json'), '')
+
+    def test_get_local_content_reuses_cached_hashes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_manager = LocalContentManager()
+            local_manager.content_dir = Path(tmp_dir) / 'content'
+            local_manager.content_dir.mkdir()
+            local_manager.hash_cache_file = Path(tmp_dir) / 'hash_cache.json'
+            (local_manager.content_dir / 'page-1.json').write_text('{"title": "Page 1"}')
+            (local_manager.content_dir / 'page-2.json').write_text('{"title": "Page 2"}')
+            (local_manager.content_dir / 'notes.txt').write_text('not content')
+            (local_manager.content_dir / 'folder.json').mkdir()
+
+            with patch.object(LocalContentManager, '_get_file_hash', wraps=local_manager._get_file_hash) as mock_hash:
+                first = local_manager.get_local_content()
+                self.assertEqual(mock_hash.call_count, 2)
+                self.assertEqual(sorted(first), ['page-1', 'page-2'])
+                local_manager.save_hash_cache()
+
+                # A new instance only rehashes the file that changed
+                mock_hash.reset_mock()
+                local_manager = LocalContentManager()
+                local_manager.content_dir = Path(tmp_dir) / 'content'
+                local_manager.hash_cache_file = Path(tmp_dir) / 'hash_cache.json'
+                (local_manager.content_dir / 'page-2.json').write_text('{"title": "Page 2 changed"}')
+                second = local_manager.get_local_content()
+                mock_hash.assert_called_once_with(str(local_manager.content_dir / 'page-2.json'))
+
+            self.assertEqual(first['page-1']['hash'], second['page-1']['hash'])
+            self.assertNotEqual(first['page-2']['hash'], second['page-2']['hash'])
+
+            # Reading some files keeps the cached hashes of the others
+            partial = local_manager.get_local_content(['page-1', 'missing'])
+            self.assertEqual(list(partial), ['page-1'])
+            self.assertEqual(set(local_manager._hash_cache), {'page-1.json', 'page-2.json'})
+
+    def test_save_cache_is_atomic(self):
+        syncer = ContentSyncer()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            syncer.cache_file = Path(tmp_dir) / 'sync_cache.json'
+            self.assertEqual(syncer._load_cache(), {})
+            syncer._save_cache({'page-1': 'abc'})
+            self.assertEqual(syncer._load_cache(), {'page-1': 'abc'})
+
+            # A failed write keeps the previous cache intact
+            with patch('sync_to_confluence.os.replace', side_effect=OSError('disk full')):
+                syncer._save_cache({'page-1': 'def'})
+            self.assertEqual(syncer._load_cache(), {'page-1': 'abc'})
+
+            # A corrupt cache is treated as empty, so every page is pushed again
+            syncer.cache_file.write_bytes(b'{"page-1": ')
+            self.assertEqual(syncer._load_cache(), {})
+
+    def test_sanitize_filename(self):
+        local_manager = self.api.local
+        self.assertEqual(local_manager._sanitize_filename('Release Notes: v2.0 (Draft)'), 'release-notes-v2-0-draft')
+        self.assertEqual(local_manager._sanitize_filename('--Café_menu--'), 'café-menu')
+        self.assertEqual(len(local_manager._sanitize_filename('a' * 150)), 100)
+
+    def test_get_page_id_from_filename(self):
+        local_manager = self.api.local
+        local_manager.id_to_filename = {"123": "new-page", "456": "other-page"}
+
+        self.assertEqual(local_manager.get_page_id_from_filename("new-page"), "123")
+        self.assertEqual(local_manager.get_page_id_from_filename("other-page.json"), "456")
+        self.assertIsNone(local_manager.get_page_id_from_filename("missing"))
+
+        self.assertTrue(local_manager.forget_page_id("123"))
+        self.assertFalse(local_manager.forget_page_id("123"))
+        self.assertIsNone(local_manager.get_page_id_from_filename("new-page"))
+        self.assertEqual(local_manager.id_to_filename, {"456": "other-page"})
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_manager.id_map_file = Path(tmp_dir) / 'id_mapping.json'
+            local_manager.flush_mapping()
+            self.assertEqual(orjson.loads(local_manager.id_map_file.read_bytes()), {"456": "other-page"})
+
+    @patch('pathlib.Path.write_bytes', autospec=True)
+    def test_save_content(self, mock_write_bytes):
         # Prepare the content to save
         page_id = '123'
         content = {
@@ -496,38 +872,32 @@ class TestConfluenceAPI(unittest.TestCase):
             'body': {'storage': {'value': '<p>New content</p>'}},
         }
 
-        # Create an instance of LocalContentManager
-        local_manager = LocalContentManager()
+        local_manager = self.api.local
 
         # Call the method
         local_manager.save_content(page_id, content)
 
         # Verify file operations
-        self.assertEqual(len(mock_open.call_args_list), 2, "Expected two file operations")  # Two file operations: mapping and content
-        
-        # Get the calls to open
-        calls = mock_open.call_args_list
-        self.assertEqual(len(calls), 2, "Expected two calls to open")
+        calls = mock_write_bytes.call_args_list
+        self.assertEqual(len(calls), 2, "Expected two file writes")  # Two file operations: mapping and content
         
         # Verify the first call (mapping file)
         first_call = calls[0]
-        self.assertTrue(first_call[0][0].endswith('_mapping.json'), "First call should be to mapping file")
-        self.assertEqual(first_call[0][1], 'w', "First call should be in write mode")
+        self.assertEqual(first_call[0][0].name, 'new_page_mapping.json', "First call should be to mapping file")
         
         # Verify the second call (content file)
         second_call = calls[1]
-        self.assertTrue(second_call[0][0].endswith('.json'), "Second call should be to content file")
-        self.assertEqual(second_call[0][1], 'w', "Second call should be in write mode")
+        self.assertEqual(second_call[0][0].name, 'new_page.json', "Second call should be to content file")
 
         # Verify content written
-        write_calls = mock_open().write.call_args_list
-        written_content = ''.join(call[0][0] for call in write_calls)
+        written_content = second_call[0][1].decode('utf-8')
         self.assertIn('New Page', written_content)
         self.assertIn('<p>New content</p>', written_content)
 
-    @patch('pathlib.Path.exists')
-    @patch('pathlib.Path.open', new_callable=unittest.mock.mock_open)
-    def test_pull_from_confluence(self, mock_open, mock_exists):
+        # The document is serialized once and written whole to each file
+        self.assertEqual(first_call[0][1], second_call[0][1])
+
+    def test_pull_from_confluence(self):
         # Setup mock data
         space_content = {
             'results': [
@@ -586,56 +956,45 @@ class TestConfluenceAPI(unittest.TestCase):
             {'id': 'att2', 'title': 'attachment2.jpg'}
         ]
         
-        # Setup mocks for file operations
-        mock_exists.return_value = True
-        mock_open.return_value.read.return_value = '{}'  # Empty JSON for deleted pages
-        
         # Create mock dependencies
         confluence_api = MagicMock()
         confluence_api.get_space_content.return_value = space_content
-        confluence_api.get_page_by_id.side_effect = lambda id: full_page_1 if id == '1' else full_page_2
-        confluence_api.get_attachments.side_effect = lambda id: attachments_1 if id == '1' else []
+        confluence_api.get_page_by_id.side_effect = {'1': full_page_1, '2': full_page_2}.__getitem__
+        confluence_api.get_attachments.side_effect = {'1': attachments_1, '2': []}.__getitem__
         
         local_manager = MagicMock()
         
-        # Create syncer and inject mocked dependencies
-        syncer = ContentSyncer()
-        syncer.confluence = confluence_api
-        syncer.local = local_manager
-        
-        # Execute the pull operation
-        syncer.pull_from_confluence()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Create syncer and inject mocked dependencies
+            syncer = self._make_syncer(tmp_dir)
+            syncer.confluence = confluence_api
+            syncer.local = local_manager
+            
+            # Execute the pull operation
+            syncer.pull_from_confluence()
         
         # Verify space content was retrieved
         confluence_api.get_space_content.assert_called_once()
         
         # Verify each page was processed
-        confluence_api.get_page_by_id.assert_has_calls([
-            call('1'),
-            call('2')
-        ])
+        self.assertEqual(confluence_api.get_page_by_id.call_args_list, [call('1'), call('2')])
         
         # Verify content was saved locally
-        local_manager.save_content.assert_has_calls([
+        self.assertEqual(local_manager.save_content.call_args_list, [
             call('1', full_page_1),
             call('2', full_page_2)
         ])
         
         # Verify attachments were retrieved
-        confluence_api.get_attachments.assert_has_calls([
-            call('1'),
-            call('2')
-        ])
+        self.assertEqual(confluence_api.get_attachments.call_args_list, [call('1'), call('2')])
         
-        # Verify attachments were downloaded for page 1
-        confluence_api._download_attachment.assert_has_calls([
+        # Verify attachments were downloaded for page 1, concurrently
+        self.assertCountEqual(confluence_api._download_attachment.call_args_list, [
             call('1', {'id': 'att1', 'title': 'attachment1.pdf'}),
             call('1', {'id': 'att2', 'title': 'attachment2.jpg'})
         ])
 
-    @patch('pathlib.Path.exists')
-    @patch('pathlib.Path.open', new_callable=unittest.mock.mock_open)
-    def test_pull_from_confluence_with_errors(self, mock_open, mock_exists):
+    def test_pull_from_confluence_with_errors(self):
         # Setup mock data with errors
         space_content = {
             'results': [
@@ -658,10 +1017,6 @@ class TestConfluenceAPI(unittest.TestCase):
             }
         }
 
-        # Setup mocks for file operations
-        mock_exists.return_value = True
-        mock_open.return_value.read.return_value = '{"789": {"version": 1}}'  # Deleted page
-
         # Create mock dependencies
         confluence_api = MagicMock()
         confluence_api.get_space_content.return_value = space_content
@@ -694,13 +1049,15 @@ class TestConfluenceAPI(unittest.TestCase):
 
         local_manager = MagicMock()
 
-        # Create syncer and inject mocked dependencies
-        syncer = ContentSyncer()
-        syncer.confluence = confluence_api
-        syncer.local = local_manager
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Create syncer and inject mocked dependencies; page 789 was deleted
+            syncer = self._make_syncer(tmp_dir)
+            syncer.deleted_pages_file.write_bytes(orjson.dumps(['789']))
+            syncer.confluence = confluence_api
+            syncer.local = local_manager
 
-        # Execute the pull operation
-        syncer.pull_from_confluence()
+            # Execute the pull operation
+            syncer.pull_from_confluence()
 
         # Verify space content was retrieved
         confluence_api.get_space_content.assert_called_once()
@@ -720,9 +1077,154 @@ class TestConfluenceAPI(unittest.TestCase):
         }
         local_manager.save_content.assert_called_once_with('1', expected_content)
 
-    @patch('pathlib.Path.exists')
-    @patch('pathlib.Path.open', new_callable=unittest.mock.mock_open)
-    def test_push_to_confluence(self, mock_open, mock_exists):
+    @patch.object(ContentSyncer, '_save_page_versions')
+    @patch.object(ContentSyncer, '_load_deleted_pages', return_value=set())
+    @patch.object(ContentSyncer, '_load_page_versions', return_value={'1': 3})
+    def test_pull_from_confluence_skips_unchanged_pages(self, mock_load_versions, mock_load_deleted, mock_save_versions):
+        space_content = {
+            'results': [
+                {'id': '1', 'title': 'Page 1', 'version': {'number': 3}},
+                {'id': '2', 'title': 'Page 2', 'version': {'number': 2}}
+            ]
+        }
+        full_page_2 = {'id': '2', 'title': 'Page 2', 'version': {'number': 2}}
+
+        confluence_api = MagicMock()
+        confluence_api.get_space_content.return_value = space_content
+        confluence_api.get_page_by_id.return_value = full_page_2
+        confluence_api.get_attachments.return_value = []
+
+        syncer = ContentSyncer()
+        syncer.confluence = confluence_api
+        syncer.local = MagicMock()
+
+        syncer.pull_from_confluence()
+
+        # Only the page whose version moved is fetched and saved
+        confluence_api.get_page_by_id.assert_called_once_with('2')
+        syncer.local.save_content.assert_called_once_with('2', full_page_2)
+        # Attachments are still synced for unchanged pages
+        self.assertEqual(confluence_api.get_attachments.call_args_list, [call('1'), call('2')])
+        mock_save_versions.assert_called_once_with({'1': 3, '2': 2})
+
+    def test_pull_from_confluence_restores_missing_unchanged_page(self):
+        full_page = {'id': '1', 'title': 'Page 1', 'version': {'number': 3}}
+
+        with tempfile.TemporaryDirectory() as tmp_dir, self._local_state_env(tmp_dir):
+            syncer = self._make_syncer(tmp_dir)
+            syncer.confluence = MagicMock()
+            syncer.confluence.get_space_content.return_value = {
+                'results': [{'id': '1', 'title': 'Page 1', 'version': {'number': 3}}]
+            }
+            syncer.confluence.get_page_by_id.return_value = full_page
+            syncer.confluence.get_attachments.return_value = []
+            # The page was pulled at this version, but its file was deleted since
+            syncer.page_versions_file.write_bytes(orjson.dumps({'1': 3}))
+
+            syncer.pull_from_confluence()
+
+            self.assertEqual(orjson.loads((Path(tmp_dir) / 'content' / 'page_1.json').read_bytes())['id'], '1')
+        syncer.confluence.get_page_by_id.assert_called_once_with('1')
+
+    @patch.object(ContentSyncer, '_save_deleted_pages')
+    @patch.object(ContentSyncer, '_save_cache')
+    @patch.object(ContentSyncer, '_load_deleted_pages', return_value={'789'})
+    @patch.object(ContentSyncer, '_load_cache', return_value={'page-1': 'abc'})
+    def test_push_to_confluence_unchanged_skips_state_writes(self, mock_load_cache, mock_load_deleted,
+                                                             mock_save_cache, mock_save_deleted):
+        syncer = ContentSyncer()
+        syncer.confluence = MagicMock()
+        syncer.local = MagicMock()
+        syncer.local.get_local_content.return_value = {
+            'page-1': {'content': {'id': '1', 'title': 'Page 1'}, 'hash': 'abc'}
+        }
+
+        syncer.push_to_confluence()
+
+        syncer.confluence.update_page.assert_not_called()
+        mock_save_cache.assert_not_called()
+        mock_save_deleted.assert_not_called()
+
+    @patch.object(ContentSyncer, '_save_deleted_pages')
+    @patch.object(ContentSyncer, '_save_cache')
+    @patch.object(ContentSyncer, '_load_deleted_pages', return_value=set())
+    @patch.object(ContentSyncer, '_load_cache', return_value={'page-1': 'abc', 'removed': 'def'})
+    def test_push_to_confluence_pushes_changed_pages(self, mock_load_cache, mock_load_deleted,
+                                                     mock_save_cache, mock_save_deleted):
+        def update_page(page_id, content):
+            if page_id == '3':
+                raise ConfluenceAPIError('Conflict', status_code=409)
+            return {}
+
+        syncer = ContentSyncer()
+        syncer.confluence = MagicMock()
+        syncer.confluence.update_page.side_effect = update_page
+        syncer.local = MagicMock()
+        syncer.local.get_page_id_from_filename.side_effect = {'removed': '9'}.get
+        syncer.local.get_local_content.return_value = {
+            'page-1': {'content': {'id': '1', 'title': 'Page 1'}, 'hash': 'abc'},
+            'page-2': {'content': {'id': '2', 'title': 'Page 2'}, 'hash': 'new'},
+            'page-3': {'content': {'id': '3', 'title': 'Page 3'}, 'hash': 'new'}
+        }
+
+        syncer.push_to_confluence()
+
+        syncer.confluence.delete_page.assert_called_once_with('9')
+        self.assertCountEqual(syncer.confluence.update_page.call_args_list, [
+            call('2', {'id': '2', 'title': 'Page 2'}),
+            call('3', {'id': '3', 'title': 'Page 3'})
+        ])
+        # The failed page is retried on the next push; the removed file is forgotten
+        mock_save_cache.assert_called_once_with({'page-1': 'abc', 'page-2': 'new'})
+        mock_save_deleted.assert_called_once_with({'9'})
+
+    def test_push_to_confluence_only_given_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            syncer = self._make_syncer(tmp_dir, max_workers=2)
+            syncer.confluence = MagicMock()
+            syncer.confluence.update_page.return_value = {}
+            syncer.local = MagicMock()
+            syncer.local.get_page_id_from_filename.side_effect = {'removed': '9', 'gone': '8'}.get
+            # Only the requested file that still exists is read
+            syncer.local.get_local_content.return_value = {
+                'page-2': {'content': {'id': '2', 'title': 'Page 2'}, 'hash': 'new'}
+            }
+            syncer.cache_file.write_bytes(orjson.dumps({'page-1': 'abc', 'page-2': 'def', 'removed': 'ghi'}))
+
+            with patch('sync_to_confluence.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_pool:
+                syncer.push_to_confluence(filenames=['page-2', 'gone'])
+
+            # Files outside the request are neither pushed nor taken for deleted
+            self.assertEqual(orjson.loads(syncer.cache_file.read_bytes()),
+                             {'page-1': 'abc', 'page-2': 'new', 'removed': 'ghi'})
+            self.assertFalse(syncer.deleted_pages_file.exists())
+
+        mock_pool.assert_called_once_with(max_workers=2)
+        syncer.local.get_local_content.assert_called_once_with({'page-2', 'gone'})
+        syncer.confluence.update_page.assert_called_once_with('2', {'id': '2', 'title': 'Page 2'})
+        syncer.confluence.delete_page.assert_not_called()
+
+    def test_watch_deleted_file_deletes_page(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            syncer = self._make_syncer(tmp_dir)
+            syncer.confluence = MagicMock()
+            syncer.local = MagicMock()
+            syncer.local.get_page_id_from_filename.side_effect = {'page-1': '1', 'removed': '9'}.get
+            # The deleted file is no longer found on disk
+            syncer.local.get_local_content.return_value = {}
+            syncer.cache_file.write_bytes(orjson.dumps({'page-1': 'abc', 'removed': 'def'}))
+            handler = ContentChangeHandler(syncer)
+
+            handler.on_deleted(_make_event('/content/removed.json'))
+
+            self.assertEqual(orjson.loads(syncer.cache_file.read_bytes()), {'page-1': 'abc'})
+            self.assertEqual(orjson.loads(syncer.deleted_pages_file.read_bytes()), ['9'])
+
+        syncer.local.get_local_content.assert_called_once_with({'removed'})
+        syncer.confluence.delete_page.assert_called_once_with('9')
+        syncer.confluence.update_page.assert_not_called()
+
+    def test_push_to_confluence(self):
         # Setup mock data
         local_content = {
             'page1.json': {
@@ -735,26 +1237,6 @@ class TestConfluenceAPI(unittest.TestCase):
             }
         }
         
-        # Setup cache data
-        cache_data = {'page1.json': 'oldhash123'}
-        
-        # Mock file operations
-        mock_exists.return_value = True
-        
-        # Setup file read mocks
-        read_mock = MagicMock()
-        
-        def read_side_effect():
-            filepath = str(mock_open.call_args[0][0])
-            if filepath.endswith('.cache.json'):
-                return json.dumps(cache_data)
-            elif filepath.endswith('deleted_pages.json'):
-                return '[]'
-            return '{}'
-            
-        read_mock.side_effect = read_side_effect
-        mock_open.return_value.read = read_mock
-        
         # Create mock dependencies
         confluence_api = MagicMock()
         confluence_api.update_page.return_value = None
@@ -762,19 +1244,29 @@ class TestConfluenceAPI(unittest.TestCase):
         
         local_manager = MagicMock()
         local_manager.get_local_content.return_value = local_content
-        local_manager.get_page_id_from_filename.side_effect = lambda filename: local_content[filename]['content'].get('id')
+        local_manager.get_page_id_from_filename.side_effect = {'page1.json': '123'}.get
         
-        # Create syncer and inject mocked dependencies
-        syncer = ContentSyncer()
-        syncer.confluence = confluence_api
-        syncer.local = local_manager
-        
-        # Execute the push operation
-        syncer.push_to_confluence()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Create syncer and inject mocked dependencies
+            syncer = self._make_syncer(tmp_dir)
+            syncer.confluence = confluence_api
+            syncer.local = local_manager
+            # Page 1 was pushed before with different content
+            syncer.cache_file.write_bytes(orjson.dumps({'page1.json': 'oldhash123'}))
+            
+            # Execute the push operation
+            syncer.push_to_confluence()
+            
+            # Both pages are recorded with their pushed hash
+            self.assertEqual(orjson.loads(syncer.cache_file.read_bytes()),
+                             {'page1.json': 'hash123', 'page2.json': 'hash456'})
         
         # Verify local content was retrieved
         local_manager.get_local_content.assert_called_once()
         
+        # The existing page was listed up front; the new one has no ID yet
+        confluence_api.prefetch_pages.assert_called_once_with(['123', None])
+        
         # Verify page updates and creations
         confluence_api.update_page.assert_called_once_with('123', local_content['page1.json']['content'])
         confluence_api.create_page.assert_called_once_with(local_content['page2.json']['content'])
@@ -782,9 +1274,29 @@ class TestConfluenceAPI(unittest.TestCase):
         # Verify content was saved after creation
         local_manager.save_content.assert_called_once_with('new456', {'id': 'new456', 'title': 'Page 2', 'body': {'storage': {'value': '<p>Content 2</p>'}}, 'version': {'number': 1}})
 
-    @patch('pathlib.Path.exists')
-    @patch('pathlib.Path.open', new_callable=unittest.mock.mock_open)
-    def test_push_to_confluence_with_errors(self, mock_open, mock_exists):
+    def test_push_to_confluence_twice_unchanged(self):
+        confluence_api = MagicMock()
+        confluence_api.create_page.return_value = {'id': 'new1'}
+        local_manager = MagicMock()
+        local_manager.get_page_id_from_filename.return_value = None
+        local_manager.get_local_content.side_effect = lambda filenames=None: {
+            'page1': {'hash': 'hash1', 'content': {'title': 'Page 1'}}
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            syncer = self._make_syncer(tmp_dir)
+            syncer.confluence = confluence_api
+            syncer.local = local_manager
+
+            syncer.push_to_confluence()
+            confluence_api.create_page.assert_called_once_with({'title': 'Page 1', 'id': 'new1'})
+            confluence_api.reset_mock()
+            syncer.push_to_confluence()
+
+        # The second push finds the pushed hash in the sync cache
+        self.assertEqual(confluence_api.mock_calls, [])
+
+    def test_push_to_confluence_with_errors(self):
         # Setup mock data with errors
         local_content = {
             'page1.json': {
@@ -793,23 +1305,6 @@ class TestConfluenceAPI(unittest.TestCase):
             }
         }
         
-        # Mock file operations
-        mock_exists.return_value = True
-        
-        # Setup file read mocks
-        read_mock = MagicMock()
-        
-        def read_side_effect():
-            filepath = str(mock_open.call_args[0][0])
-            if filepath.endswith('.cache.json'):
-                return '{}'
-            elif filepath.endswith('deleted_pages.json'):
-                return '[]'
-            return '{}'
-            
-        read_mock.side_effect = read_side_effect
-        mock_open.return_value.read = read_mock
-        
         # Create mock dependencies
         confluence_api = MagicMock()
         confluence_api.create_page.side_effect = ConfluenceAPIError('Failed to create page', status_code=500)
@@ -818,13 +1313,17 @@ class TestConfluenceAPI(unittest.TestCase):
         local_manager.get_local_content.return_value = local_content
         local_manager.get_page_id_from_filename.return_value = None  # No existing page ID
         
-        # Create syncer and inject mocked dependencies
-        syncer = ContentSyncer()
-        syncer.confluence = confluence_api
-        syncer.local = local_manager
-        
-        # Execute the push operation
-        syncer.push_to_confluence()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Create syncer and inject mocked dependencies; no state was saved yet
+            syncer = self._make_syncer(tmp_dir)
+            syncer.confluence = confluence_api
+            syncer.local = local_manager
+            
+            # Execute the push operation
+            syncer.push_to_confluence()
+            
+            # The failed page is not recorded as pushed
+            self.assertFalse(syncer.cache_file.exists())
         
         # Verify local content was retrieved
         local_manager.get_local_content.assert_called_once()
@@ -834,12 +1333,9 @@ class TestConfluenceAPI(unittest.TestCase):
         confluence_api.update_page.assert_not_called()
         local_manager.save_content.assert_not_called()
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_page_body_valid(self, mock_get):
+    def test_get_page_body_valid(self):
         # Mock the response for the get_page_body method
-        mock_response = MagicMock()
-        mock_response.ok = True
-        mock_response.json.return_value = {
+        mock_response = _ok_response({
             'id': '12345',
             'title': 'Test Page',
             'space': {'key': 'your_space_key'},  # Correct space key
@@ -850,8 +1346,8 @@ class TestConfluenceAPI(unittest.TestCase):
                 }
             },
             'version': {'number': 1}
-        }
-        mock_get.return_value = mock_response
+        })
+        self.mock_get.return_value = mock_response
 
         # Call the method
         page = self.api.get_page_body('12345')
@@ -860,15 +1356,64 @@ class TestConfluenceAPI(unittest.TestCase):
         self.assertEqual(page['representation'], 'storage')
         self.assertEqual(page['value'], '<p>Test content</p>')
 
-    @patch('sync_to_confluence.requests.Session.get')
-    def test_get_page_body_invalid(self, mock_get):
-        mock_response = MagicMock()
-        mock_response.ok = False
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError
-        mock_get.return_value = mock_response
+    def test_get_page_body_invalid(self):
+        self.mock_get.return_value = _error_response(500)
         with self.assertRaises(ConfluenceAPIError):
             self.api.get_page_body(page_id='12345')
 
+    def test_failed_attachments_kept_in_memory_until_flush(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.cache_dir = Path(tmp_dir)
+            failed_file = Path(tmp_dir) / '.failed_attachments'
+
+            for _ in range(3):
+                self.api._mark_failed_attachment('broken.pdf')
+            self.assertTrue(self.api._should_skip_attachment('broken.pdf'))
+            self.assertFalse(self.api._should_skip_attachment('other.pdf'))
+            self.assertFalse(failed_file.exists())
+
+            self.api._flush_failed_attachments()
+            self.assertEqual(len(orjson.loads(failed_file.read_bytes())['broken.pdf']), 3)
+
+            # A new instance picks the failures up from disk
+            api = ConfluenceAPI(session=self.api.session)
+            api.local.cache_dir = Path(tmp_dir)
+            self.assertTrue(api._should_skip_attachment('broken.pdf'))
+            api._clear_failed_attachment('broken.pdf')
+            api._flush_failed_attachments()
+            self.assertEqual(orjson.loads(failed_file.read_bytes()), {})
+
+    def test_client_can_be_freed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            api = ConfluenceAPI()
+            refs = [weakref.ref(api), weakref.ref(api.local)]
+            api._queue_write(Path(tmp_dir) / 'written.json', b'{}')
+
+            # Neither the exit-time flush nor a running metadata writer keeps
+            # discarded clients or their local content managers alive
+            del api
+            gc.collect()
+            self.assertEqual([ref() for ref in refs], [None, None])
+
+    def test_failed_attachments_converts_iso_timestamps(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api.local.cache_dir = Path(tmp_dir)
+            recent = datetime.now().isoformat()
+            stale = (datetime.now() - timedelta(days=2)).isoformat()
+            (Path(tmp_dir) / '.failed_attachments').write_bytes(orjson.dumps({
+                'recent.pdf': [recent, recent, recent],
+                'stale.pdf': [stale, stale, stale],
+            }))
+
+            self.assertTrue(self.api._should_skip_attachment('recent.pdf'))
+            self.assertFalse(self.api._should_skip_attachment('stale.pdf'))
+
+            self.api._mark_failed_attachment('stale.pdf')
+            failures = self.api._get_failed_attachments()['stale.pdf']
+            self.assertEqual(len(failures), 1)
+            self.assertIsInstance(failures[0], float)
+            self.api._flush_failed_attachments()
+
     def test_clean_adf_content_double_nested(self):
         content = {
             'value': {
@@ -889,103 +1434,116 @@ class TestConfluenceAPI(unittest.TestCase):
         self.assertEqual(cleaned_content['value']['type'], 'doc')
 
 class TestContentChangeHandler(unittest.TestCase):
-    @patch('sync_to_confluence.ContentSyncer')
-    def test_on_modified(self, MockContentSyncer):
-        # Setup mock syncer
-        mock_syncer = MockContentSyncer.return_value
-        handler = ContentChangeHandler(mock_syncer)
+    @classmethod
+    def setUpClass(cls):
+        # The handler only calls push_to_confluence, so no ContentSyncer is
+        # built; the spec is introspected once for the class
+        cls.syncer = Mock(spec=ContentSyncer)
+
+    def setUp(self):
+        self.syncer.reset_mock(return_value=True, side_effect=True)
+
+    def test_on_modified(self):
+        handler = ContentChangeHandler(self.syncer)
         
         # Create a mock event for a modified JSON file
-        mock_event = MagicMock(spec=FileSystemEvent)
-        mock_event.is_directory = False
-        mock_event.src_path = '/path/to/modified_file.json'
+        mock_event = _make_event('/path/to/modified_file.json')
         
         # Call the on_modified method
-        handler.on_modified(mock_event)
-        
-        # Verify that push_to_confluence was called
-        mock_syncer.push_to_confluence.assert_called_once()
-        
-        # Verify logging
         with self.assertLogs('sync_to_confluence', level='INFO') as log:
             handler.on_modified(mock_event)
-            self.assertIn("INFO:sync_to_confluence:Change detected in /path/to/modified_file.json", log.output)
-
-    @patch('sync_to_confluence.ContentSyncer')
-    def test_on_modified_non_json(self, MockContentSyncer):
-        # Setup mock syncer
-        mock_syncer = MockContentSyncer.return_value
-        handler = ContentChangeHandler(mock_syncer)
-        
-        # Create a mock event for a modified non-JSON file
-        mock_event = MagicMock(spec=FileSystemEvent)
-        mock_event.is_directory = False
-        mock_event.src_path = '/path/to/modified_file.txt'
-        
-        # Call the on_modified method
-        handler.on_modified(mock_event)
-        
-        # Verify that push_to_confluence was not called
-        mock_syncer.push_to_confluence.assert_not_called()
-
-    @patch('sync_to_confluence.ContentSyncer')
-    def test_on_modified_directory(self, MockContentSyncer):
-        # Setup mock syncer
-        mock_syncer = MockContentSyncer.return_value
-        handler = ContentChangeHandler(mock_syncer)
-        
-        # Create a mock event for a directory modification
-        mock_event = MagicMock(spec=FileSystemEvent)
-        mock_event.is_directory = True
-        mock_event.src_path = '/path/to/directory'
         
-        # Call the on_modified method
-        handler.on_modified(mock_event)
-        
-        # Verify that push_to_confluence was not called
-        mock_syncer.push_to_confluence.assert_not_called()
-
-    @patch('sync_to_confluence.ContentSyncer')
-    def test_push_to_confluence_network_error(self, MockContentSyncer):
-        # Setup mock syncer
-        mock_syncer = MockContentSyncer.return_value
-        handler = ContentChangeHandler(mock_syncer)
-        
-        # Create a mock event for a modified JSON file
-        mock_event = MagicMock(spec=FileSystemEvent)
-        mock_event.is_directory = False
-        mock_event.src_path = '/path/to/modified_file.json'
-        
-        # Simulate a network error when pushing to Confluence
-        mock_syncer.push_to_confluence.side_effect = ConnectionError('Network error')
-        
-        # Call the on_modified method
-        with self.assertRaises(ConnectionError):
+        # Verify that only the modified file was pushed, and that it was logged
+        self.syncer.push_to_confluence.assert_called_once_with(filenames={'modified_file'})
+        self.assertIn("INFO:sync_to_confluence:Change detected in /path/to/modified_file.json", log.output)
+
+    def test_on_modified_debounced(self):
+        handler = ContentChangeHandler(self.syncer, debounce=0.05)
+
+        mock_event = _make_event('/path/to/modified_file.json')
+
+        # A burst of events results in a single push of every changed file
+        # once it settles
+        for i in range(10):
+            mock_event.src_path = f'/path/to/modified_file_{i % 2}.json'
             handler.on_modified(mock_event)
-        
-        # Verify that push_to_confluence was called
-        mock_syncer.push_to_confluence.assert_called_once()
-
-    @patch('sync_to_confluence.ContentSyncer')
-    def test_push_to_confluence_invalid_response(self, MockContentSyncer):
-        # Setup mock syncer
-        mock_syncer = MockContentSyncer.return_value
-        handler = ContentChangeHandler(mock_syncer)
-        
-        # Create a mock event for a modified JSON file
-        mock_event = MagicMock(spec=FileSystemEvent)
-        mock_event.is_directory = False
-        mock_event.src_path = '/path/to/modified_file.json'
-        
-        # Simulate an invalid response when pushing to Confluence
-        mock_syncer.push_to_confluence.side_effect = ConfluenceAPIError('Invalid response', status_code=400)
-        
-        # Call the on_modified method
-        with self.assertRaises(ConfluenceAPIError):
+        timer = handler._timer
+
+        timer.join()
+        self.syncer.push_to_confluence.assert_called_once_with(filenames={'modified_file_0', 'modified_file_1'})
+
+    @patch('sync_to_confluence.threading.Timer')
+    @patch('sync_to_confluence.time.monotonic')
+    def test_on_modified_debounce_max_wait(self, mock_monotonic, mock_timer):
+        handler = ContentChangeHandler(self.syncer, debounce=0.5, max_wait=2.0)
+
+        mock_event = _make_event('/path/to/modified_file.json')
+
+        # Events keep arriving, so the quiet period is cut short to end
+        # max_wait after the first one
+        for now, expected_delay in ((100.0, 0.5), (101.0, 0.5), (101.8, 0.2), (102.5, 0.0)):
+            mock_monotonic.return_value = now
             handler.on_modified(mock_event)
-        
-        # Verify that push_to_confluence was called
-        mock_syncer.push_to_confluence.assert_called_once()
+            self.assertAlmostEqual(mock_timer.call_args[0][0], expected_delay)
+        self.assertEqual(mock_timer.return_value.cancel.call_count, 3)
+
+        # Once pushed, the next burst starts a new window
+        handler._push_changes()
+        self.syncer.push_to_confluence.assert_called_once()
+        mock_monotonic.return_value = 200.0
+        handler.on_modified(mock_event)
+        self.assertEqual(mock_timer.call_args[0][0], 0.5)
+
+    def test_on_deleted(self):
+        handler = ContentChangeHandler(self.syncer)
+
+        handler.on_deleted(_make_event('/path/to/removed_file.json'))
+
+        self.syncer.push_to_confluence.assert_called_once_with(filenames={'removed_file'})
+
+    def test_on_moved(self):
+        handler = ContentChangeHandler(self.syncer)
+
+        # (source, destination, files pushed)
+        cases = [
+            ('/path/to/old_name.json', '/path/to/new_name.json', {'old_name', 'new_name'}),
+            # An editor saving through a temp file only renames onto the page
+            ('/path/to/.new_name.json.tmp', '/path/to/new_name.json', {'new_name'}),
+        ]
+        for src_path, dest_path, expected in cases:
+            with self.subTest(src_path=src_path):
+                self.syncer.reset_mock()
+
+                handler.on_moved(_make_event(src_path, dest_path=dest_path))
+
+                self.syncer.push_to_confluence.assert_called_once_with(filenames=expected)
+
+    def test_on_modified_ignored(self):
+        handler = ContentChangeHandler(self.syncer)
+
+        # Neither non-JSON files nor directories are pushed
+        for mock_event in (_make_event('/path/to/modified_file.txt'),
+                           _make_event('/path/to/directory', is_dir=True)):
+            with self.subTest(src_path=mock_event.src_path):
+                handler.on_modified(mock_event)
+
+                self.syncer.push_to_confluence.assert_not_called()
+
+    def test_push_to_confluence_error(self):
+        handler = ContentChangeHandler(self.syncer)
+        mock_event = _make_event('/path/to/modified_file.json')
+
+        # Without debouncing, a failed push reaches the caller
+        for error in (ConnectionError('Network error'),
+                      ConfluenceAPIError('Invalid response', status_code=400)):
+            with self.subTest(error=type(error).__name__):
+                self.syncer.reset_mock(side_effect=True)
+                self.syncer.push_to_confluence.side_effect = error
+
+                # The side effect raises on every call, so a raise means
+                # exactly one push was attempted
+                with self.assertRaises(type(error)):
+                    handler.on_modified(mock_event)
 
 if __name__ == '__main__':
     unittest.main()